@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import click
-import requests
 
-from robomania.bot import configure_bot, main
-from robomania.utils.constants import HEALTHCHECK_GOOD_STATUS_CODE
+from robomania.probe import TIMEOUT, probe
+
+# Commands, that don't need the bot to be configured.
+STANDALONE_COMMANDS = ("healthcheck", "importtime")
 
 
 @click.group(invoke_without_command=True)
 @click.pass_context
 def cli(ctx: click.Context) -> None:
-    if ctx.invoked_subcommand != "healthcheck":
+    if ctx.invoked_subcommand not in STANDALONE_COMMANDS:
+        from robomania.bot import configure_bot
+
         configure_bot()
     if ctx.invoked_subcommand is None:
         ctx.invoke(run)
@@ -24,20 +27,28 @@ def setup_database() -> None:
 
 
 @cli.command()
-def healthcheck() -> int:
-    try:
-        response = requests.get("http://localhost:6302/healthcheck")
-    except Exception as e:
-        print(e)
-        return 1
+@click.option("--timeout", type=float, default=TIMEOUT, show_default=True)
+@click.pass_context
+def healthcheck(ctx: click.Context, timeout: float) -> None:
+    # `python -m robomania.probe` does the same without importing click.
+    ctx.exit(probe(timeout=timeout))
 
-    if response.status_code == HEALTHCHECK_GOOD_STATUS_CODE:
-        return 0
-    return 1
+
+@cli.command()
+@click.option("--limit", type=int, default=20, show_default=True)
+def importtime(limit: int) -> None:
+    """Show the slowest imports done before the bot can start."""
+    from robomania.config import settings
+    from robomania.utils.import_profile import format_report, profile_imports
+
+    times = profile_imports(("robomania.bot", *settings.load_extensions))
+    click.echo(format_report(times, limit))
 
 
 @cli.command()
 def run() -> None:
+    from robomania.bot import main
+
     main()
 
 
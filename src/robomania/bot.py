@@ -1,23 +1,66 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import contextlib
+import hashlib
+import json
 import logging
+import time
 from contextvars import ContextVar
 from importlib import resources
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Generator, Protocol, cast
+from types import MappingProxyType
+from typing import Any, Generator, Mapping, Protocol
 
 import disnake
 import pytz
 from disnake.ext import commands
+from disnake.ext.commands.interaction_bot_base import _app_commands_diff
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 from pymongo.database import Database
 
 from robomania.config import Settings, settings
-from robomania.locale import DefaultLocale
+from robomania.locale import (
+    TEMPLATES,
+    Template,
+    compile_templates,
+    compile_translations,
+    load_localizations,
+    locale_signature,
+)
 from robomania.utils.exceptions import NoInstanceError
 from robomania.utils.healthcheck import HealthcheckClient
+from robomania.utils.logs import QueueLogging, file_handler
+from robomania.utils.loop_monitor import LoopLagMonitor
+from robomania.utils.metrics import metrics
+from robomania.utils.mongo_monitoring import MongoMonitor
+
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+# Timers of commands, that never completed, are dropped past this size.
+MAX_PENDING_COMMANDS = 1000
+
+commands_total = metrics.counter(
+    "robomania_commands_total", "Invoked slash commands", ("command", "status")
+)
+command_latency = metrics.histogram(
+    "robomania_command_seconds", "Slash command handling time", ("command",)
+)
+command_started_at: dict[int, float] = {}
+# Separate, so it can be sampled with `log_sampling`.
+translation_logger = logging.getLogger("robomania.translations")
+
+
+def hash_payload(payload: dict[str, Any]) -> str:
+    data = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+Translations = Mapping[tuple[disnake.Locale, str], str]
+Templates = Mapping[tuple[disnake.Locale, str], Template]
 
 intents = disnake.Intents.default()
 intents.typing = False
@@ -33,9 +76,18 @@ class Robomania(commands.Bot):
     client: AsyncIOMotorClient
     settings: Settings = settings
     __bot: Robomania
-    __blocking_db_counter = 0
+    _sync_client: MongoClient | None = None
+    mongo_monitor: MongoMonitor
+    loop_monitor: LoopLagMonitor
+    started_at: float | None = None
+    locale_path: Path
+    locale_watcher: asyncio.Task | None = None
     timezone = pytz.timezone("Europe/Warsaw")
 
+    translations: Translations = MappingProxyType({})
+    templates: Templates = MappingProxyType({})
+    _missing_translations: set[tuple[disnake.Locale, str]] = set()
+
     _current_locale = ContextVar(
         "_current_locale",
         default=disnake.enums.Locale.en_GB,
@@ -44,11 +96,20 @@ class Robomania(commands.Bot):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.__class__.__bot = self
+        self.mongo_monitor = MongoMonitor()
+        metrics.add_collector(self.mongo_monitor.render_metrics)
 
     def setup(self) -> None:
-        with resources.path("robomania", "locale") as locale_path:
-            self.i18n.load(locale_path)
-        self.client = AsyncIOMotorClient(str(settings.db_url))
+        with resources.path("robomania", "locale") as package_locale_path:
+            self.locale_path = settings.locale_path or Path(package_locale_path)
+            self.i18n.load(self.locale_path)
+            self.load_translations(self.locale_path)
+        self.client = AsyncIOMotorClient(
+            str(settings.db_url),
+            maxPoolSize=settings.db_max_pool_size,
+            minPoolSize=settings.db_min_pool_size,
+            **self.mongo_client_options(),
+        )
 
         if settings.debug:
             logger.warning("Running in DEBUG mode.")
@@ -56,36 +117,146 @@ class Robomania(commands.Bot):
             self._sync_commands_debug = True
             self._test_guilds = (958823316850880512,)
 
-    @contextlib.contextmanager
-    def blocking_db(self) -> Generator[MongoClient, None, None]:
-        if self.__blocking_db_counter == 0:
-            async_client = self.client
-            self.client = MongoClient(str(settings.db_url))
-
-        self.__blocking_db_counter += 1
-        try:
-            yield cast(MongoClient, self.client)
-        finally:
-            self.__blocking_db_counter -= 1
-            if self.__blocking_db_counter == 0:
-                self.client.close()
-                self.client = async_client
+    @property
+    def sync_client(self) -> MongoClient:
+        """Blocking client, created on first use and shared afterwards."""
+        if self._sync_client is None:
+            self._sync_client = MongoClient(
+                str(settings.db_url),
+                maxPoolSize=settings.db_sync_max_pool_size,
+                minPoolSize=settings.db_sync_min_pool_size,
+                **self.mongo_client_options(),
+            )
+        return self._sync_client
+
+    def mongo_client_options(self) -> dict[str, Any]:
+        compressors = [
+            i
+            for i in settings.db_compressors
+            if (module := COMPRESSOR_MODULES.get(i)) and find_spec(module)
+        ]
+        options: dict[str, Any] = {
+            "readPreference": settings.db_read_preference,
+            "event_listeners": self.mongo_monitor.listeners,
+        }
+
+        if compressors:
+            options["compressors"] = compressors
+        if settings.db_max_idle_time_ms is not None:
+            options["maxIdleTimeMS"] = settings.db_max_idle_time_ms
+
+        return options
 
     async def start(self, *args, **kwargs) -> None:
         if settings.debug:
             self.loop.set_debug(True)
 
-        self.healthcheck_client = await HealthcheckClient.start(self)
+        self.loop_monitor = LoopLagMonitor(threshold=settings.loop_lag_threshold)
+        self.loop_monitor.start()
+
+        if settings.locale_path is not None and settings.locale_watch_interval:
+            self.locale_watcher = asyncio.create_task(
+                self.watch_locale(settings.locale_watch_interval)
+            )
+
+        self.healthcheck_client = await HealthcheckClient.start(
+            self, max_loop_lag=settings.healthcheck_max_loop_lag
+        )
         await super().start(*args, **kwargs)
 
     async def close(self) -> None:
+        if self.locale_watcher is not None:
+            self.locale_watcher.cancel()
+        self.loop_monitor.stop()
         await self.healthcheck_client.shutdown()
         await super().close()
 
-    def get_db(self, name: str) -> Database:
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    def command_payload(self) -> dict[str, Any]:
+        """Localized application commands, in the form they are synced."""
+        global_commands, guild_commands = self._ordered_unsynced_commands(
+            self._test_guilds
+        )
+
+        def to_payload(commands: list[disnake.ApplicationCommand]) -> list[dict]:
+            for command in commands:
+                command.localize(self.i18n)
+            payload = [command.to_dict() for command in commands]
+            return sorted(payload, key=lambda i: (i["type"], i["name"]))
+
+        return {
+            "global": to_payload(global_commands),
+            "guilds": {
+                str(guild_id): to_payload(commands)
+                for guild_id, commands in guild_commands.items()
+            },
+        }
+
+    def global_commands_synced(self) -> bool:
+        global_commands, _ = self._ordered_unsynced_commands(self._test_guilds)
+        diff = _app_commands_diff(
+            global_commands, self._connection._global_application_commands.values()
+        )
+        return not (diff["upsert"] or diff["edit"])
+
+    async def _prepare_application_commands(self) -> None:
+        """Sync application commands only when their localized payload changed
+        since the last successful sync.
+
+        Guild commands are always fetched, because disnake treats commands
+        missing from its guild cache as stale and removes them.
+        """
+        from robomania.models.command_sync import CommandSyncState
+
+        if (
+            not settings.skip_unchanged_command_sync
+            or not self._command_sync_flags._sync_enabled
+        ):
+            await super()._prepare_application_commands()
+            return
+
+        async with self._sync_queued:
+            await self.wait_until_first_connect()
+
+            payload = self.command_payload()
+            if payload["guilds"]:
+                await self._cache_application_commands()
+                await self._sync_application_commands()
+                return
+
+            assert self.application_id is not None
+            db = self.get_db("robomania")
+            payload_hash = hash_payload(payload)
+
+            try:
+                synced_hash = await CommandSyncState.get_hash(db, self.application_id)
+            except Exception as e:
+                logger.warning("Failed to read command sync state", exc_info=e)
+                synced_hash = None
+
+            if synced_hash == payload_hash:
+                logger.info("Application commands are unchanged, skipping sync")
+                return
+
+            await self._cache_application_commands()
+            await self._sync_application_commands()
+
+            if not self.global_commands_synced():
+                return
+            try:
+                await CommandSyncState.set_hash(db, self.application_id, payload_hash)
+            except Exception as e:
+                logger.warning("Failed to save command sync state", exc_info=e)
+
+    def get_db(self, name: str, blocking: bool = False) -> Database:
         if settings.environment:
             name = f"{name}-{settings.environment}"
-        return self.client[name]
+
+        client = self.sync_client if blocking else self.client
+        return client[name]
 
     @classmethod
     def get_bot(cls) -> Robomania:
@@ -96,37 +267,104 @@ class Robomania(commands.Bot):
 
     @classmethod
     def tr(cls, key: str, default: str | None = None) -> str:
-        bot: Robomania = cls.get_bot()
         locale = cls._current_locale.get()
 
-        logger.debug(f'Get translation: {{"{locale}": "{key}"}}')
         try:
-            translations = bot.i18n.get(key)
-            assert translations
-        except (disnake.LocalizationKeyError, AttributeError, AssertionError):
-            logger.warning(f'Missing localization for key: "{key}"')
-            value = None
-        else:
-            value = translations.get(locale.value, None)
-
-        if value is None and default:
-            return default
-
-        if value is None:
-            logger.warning(
+            return cls.translations[locale, key]
+        except KeyError:
+            pass
+
+        missing = (locale, key)
+        if missing not in cls._missing_translations:
+            cls._missing_translations.add(missing)
+            translation_logger.warning(
                 f'Missing localization for key: "{key}" for "{locale}" locale'
             )
-            value = DefaultLocale.get(key)
 
-        return value
+        return default or key
+
+    @classmethod
+    def template(cls, key: str) -> Template:
+        try:
+            return cls.templates[cls._current_locale.get(), key]
+        except KeyError:
+            return Template(cls.tr(key), TEMPLATES.get(key, ()))
+
+    @classmethod
+    def compile_locale(cls, path: Path) -> tuple[Translations, Templates]:
+        locales = {cls.resolve_locale(i) for i in disnake.Locale}
+        localizations = load_localizations(path)
+
+        translations = MappingProxyType(compile_translations(localizations, locales))
+        return translations, MappingProxyType(compile_templates(translations))
+
+    @classmethod
+    def set_translations(cls, translations: Translations, templates: Templates) -> None:
+        cls.translations = translations
+        cls.templates = templates
+        cls._missing_translations = set()
+        logger.info(
+            f"Compiled {len(cls.translations)} translations "
+            f"and {len(cls.templates)} templates"
+        )
+
+    @classmethod
+    def load_translations(cls, path: Path) -> None:
+        cls.set_translations(*cls.compile_locale(path))
+
+    async def reload_locale(self) -> None:
+        """Reload locale files, parsing them in a thread.
+
+        Everything is swapped at once, when parsing succeeds, so a broken file
+        keeps the previous translations.
+        """
+        path = self.locale_path
+
+        def load() -> tuple[disnake.LocalizationStore, Translations, Templates]:
+            translations, templates = self.compile_locale(path)
+            i18n = disnake.LocalizationStore(strict=False)
+            i18n.load(path)
+            return i18n, translations, templates
+
+        i18n, translations, templates = await asyncio.to_thread(load)
+
+        self.i18n = i18n
+        self.set_translations(translations, templates)
+        self.dispatch("locale_reload")
+
+        # Localized names and descriptions of commands may have changed.
+        if self.is_ready():
+            self.loop.create_task(self._prepare_application_commands())
+
+    async def watch_locale(self, interval: float) -> None:
+        signature = await asyncio.to_thread(locale_signature, self.locale_path)
+
+        while True:
+            await asyncio.sleep(interval)
+
+            current = await asyncio.to_thread(locale_signature, self.locale_path)
+            if current == signature:
+                continue
+
+            signature = current
+            logger.info(f"Locale files changed, reloading {self.locale_path}")
+            try:
+                await self.reload_locale()
+            except Exception as e:
+                logger.error("Failed to reload locale files", exc_info=e)
+
+    @staticmethod
+    def resolve_locale(locale: disnake.enums.Locale) -> disnake.enums.Locale:
+        if locale.value not in settings.available_locales:
+            return settings.default_locale
+        return locale
 
     @classmethod
     @contextlib.contextmanager
     def localize(
         cls, locale: disnake.enums.Locale
     ) -> Generator[Translator, None, None]:
-        if locale.value not in settings.available_locales:
-            locale = settings.default_locale
+        locale = cls.resolve_locale(locale)
 
         token = cls._current_locale.set(locale)
         try:
@@ -145,34 +383,79 @@ bot = Robomania(
 logger = logging.getLogger("robomania")
 
 
-def init_logger(logger: logging.Logger, out_file: str) -> None:
-    logger.setLevel(logging.DEBUG if settings.debug else logging.INFO)
-
+def init_logging() -> QueueLogging:
+    level = logging.DEBUG if settings.debug else logging.INFO
     log_folder = settings.log_folder
     log_folder.mkdir(parents=True, exist_ok=True)
 
-    formatter = logging.Formatter("%(asctime)s:%(levelname)s:%(name)s: %(message)s")
-
-    file_handler = logging.FileHandler(
-        log_folder / out_file, encoding="utf-8", mode="a"
-    )
-    file_handler.setFormatter(formatter)
-
-    stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(formatter)
+    logs = QueueLogging(settings.log_json, settings.log_sampling)
+    for name, out_file in (("robomania", "robomania.log"), ("disnake", "disnake.log")):
+        handler = file_handler(
+            log_folder / out_file,
+            max_bytes=settings.log_max_bytes,
+            backup_count=settings.log_backup_count,
+            when=settings.log_rotate_when,
+        )
+        logs.attach(logging.getLogger(name), level, handler, logging.StreamHandler())
 
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
+    # Records still in the queues are written before the interpreter exits.
+    atexit.register(logs.stop)
+    return logs
 
 
 @bot.event
 async def on_ready():
     logger.info(f'We have logged in as "{bot.user}"')
+    if bot.started_at is not None:
+        logger.info(f"Ready in {time.perf_counter() - bot.started_at:.2f} s")
+        bot.started_at = None
+
+
+def get_command_name(inter: disnake.ApplicationCommandInteraction) -> str:
+    name = inter.data.name
+    options = inter.data.options
+
+    while options and options[0].type in (
+        disnake.OptionType.sub_command,
+        disnake.OptionType.sub_command_group,
+    ):
+        name += f" {options[0].name}"
+        options = options[0].options
+
+    return name
+
+
+@bot.listen("on_application_command")
+async def start_command_timer(inter: disnake.ApplicationCommandInteraction) -> None:
+    if len(command_started_at) > MAX_PENDING_COMMANDS:
+        command_started_at.clear()
+    command_started_at[inter.id] = time.perf_counter()
+
+
+async def record_command(
+    inter: disnake.ApplicationCommandInteraction, status: str
+) -> None:
+    name = get_command_name(inter)
+    commands_total.inc(name, status)
+
+    if (started_at := command_started_at.pop(inter.id, None)) is not None:
+        command_latency.observe(time.perf_counter() - started_at, name)
+
+
+@bot.listen("on_slash_command_completion")
+async def on_command_completion(inter: disnake.ApplicationCommandInteraction) -> None:
+    await record_command(inter, "ok")
+
+
+@bot.listen("on_slash_command_error")
+async def on_command_error(
+    inter: disnake.ApplicationCommandInteraction, error: Exception
+) -> None:
+    await record_command(inter, "error")
 
 
 def configure_bot(config_path: str | Path = ".env") -> None:
-    init_logger(logger, "robomania.log")
-    init_logger(logging.getLogger("disnake"), "disnake.log")
+    init_logging()
 
     bot.setup()
 
@@ -181,6 +464,7 @@ def configure_bot(config_path: str | Path = ".env") -> None:
 
 
 def main() -> None:
+    bot.started_at = time.perf_counter()
     bot.run(settings.discord_token.get_secret_value())
 
 
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import logging
+
+from disnake import Embed
+from disnake.ext import commands
+from disnake.interactions.application_command import ApplicationCommandInteraction
+
+from robomania.bot import Robomania
+from robomania.config import settings
+
+logger = logging.getLogger("robomania.cogs.admin")
+
+
+class Admin(commands.Cog):
+    """Owner-only maintenance commands, registered only in admin guilds."""
+
+    def __init__(self, bot: Robomania):
+        self.bot = bot
+
+    @commands.slash_command(guild_ids=list(settings.admin_guild_ids))
+    @commands.is_owner()
+    async def reload_locale(self, inter: ApplicationCommandInteraction) -> None:
+        await inter.response.defer(ephemeral=True)
+
+        try:
+            await self.bot.reload_locale()
+        except Exception as e:
+            logger.error("Failed to reload locale files", exc_info=e)
+            embed = Embed(
+                title="Reload",
+                description=f"Failed to reload locale from {self.bot.locale_path}: {e}",
+                color=0xE83E3E,
+            )
+        else:
+            embed = Embed(
+                title="Reload",
+                description=f"Locale reloaded from {self.bot.locale_path}",
+                color=0xFF00C8,
+            )
+
+        await inter.send(embed=embed, ephemeral=True)
+
+
+def setup(bot: Robomania):
+    bot.add_cog(Admin(bot))
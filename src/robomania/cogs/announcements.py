@@ -2,30 +2,41 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from contextlib import aclosing
 from typing import cast
 
 import disnake
 import httpx
 from disnake.ext import commands, tasks
 from disnake.interactions.application_command import ApplicationCommandInteraction
+from pymongo.errors import PyMongoError
 
 from robomania import config
 from robomania.bot import Robomania
+from robomania.models.announcement_outbox import AnnouncementOutbox
 from robomania.models.facebook_post import FacebookPosts, FacebookPostScraped
 from robomania.types.announcement_post import AnnouncementPost
+from robomania.utils import prefetch
+from robomania.utils.scraper_client import ScraperClient
 
 logger = logging.getLogger("robomania.cogs.announcements")
 
 
 class Announcements(commands.Cog):
     target_channel: disnake.TextChannel
+    outbox_flush_task: asyncio.Future[None] | None
+    outbox_retry: asyncio.TimerHandle | None
     _DISABLE_ANNOUNCEMENTS_LOOP = False
 
     def __init__(self, bot: Robomania):
         self.bot = bot
         self.check_lock = asyncio.Lock()
+        self.outbox_flush_task = None
+        self.outbox_retry = None
+        self.outbox_dirty = False
 
         self.target_channel_id = config.settings.announcements_target_channel
+        self.scraper = ScraperClient.from_settings(config.settings)
 
         if not self._DISABLE_ANNOUNCEMENTS_LOOP:
             self.check_for_announcements.start()
@@ -66,38 +77,95 @@ class Announcements(commands.Cog):
 
     async def send_annoucements(self, posts: FacebookPosts) -> None:
         logger.info(f"Sending {len(posts)} announcements")
-        for post in posts:
-            announcement = AnnouncementPost.new(post)
-            await announcement.send(self.target_channel)
-
-        async with httpx.AsyncClient() as client:
-            await client.post(
-                f"{self.bot.settings.scraping_service_url}posts/posted",
-                json={"ids": [i.post_id for i in posts]},
-            )
+        announcements = prefetch(
+            (AnnouncementPost.new(post).prepare() for post in posts),
+            config.settings.announcements_prefetch,
+        )
+        async with aclosing(announcements):
+            async for announcement in announcements:
+                await announcement.send(self.target_channel)
+                await self.acknowledge(announcement.post.post_id)
+
+    async def acknowledge(self, post_id: str) -> None:
+        self.scraper.acknowledge([post_id])
+
+        try:
+            await AnnouncementOutbox.add(self.bot.get_db("robomania"), post_id)
+        except PyMongoError as e:
+            logger.warning(f"Couldn't save post {post_id} to outbox", exc_info=e)
+
+        self.request_outbox_flush()
+
+    def request_outbox_flush(self) -> None:
+        if self.outbox_retry is not None:
+            self.outbox_retry.cancel()
+            self.outbox_retry = None
+
+        if self.outbox_flush_task is None or self.outbox_flush_task.done():
+            self.outbox_flush_task = asyncio.ensure_future(self._flush_outbox())
+        else:
+            self.outbox_dirty = True
+
+    async def flush_outbox(self) -> None:
+        self.request_outbox_flush()
+        await asyncio.shield(cast(asyncio.Future[None], self.outbox_flush_task))
+
+    async def _flush_outbox(self) -> None:
+        db = self.bot.get_db("robomania")
+        self.outbox_dirty = True
+
+        # Posts acknowledged while a flush is running are sent in the next
+        # batch, instead of starting a request per post.
+        while self.outbox_dirty:
+            self.outbox_dirty = False
+
+            try:
+                pending = await AnnouncementOutbox.pending(db)
+            except PyMongoError as e:
+                logger.warning("Couldn't read announcements outbox", exc_info=e)
+                pending = []
+
+            if not await self.scraper.mark_as_posted(pending):
+                self.schedule_outbox_retry()
+                return
+
+            try:
+                await AnnouncementOutbox.remove(db, pending)
+            except PyMongoError as e:
+                logger.warning("Couldn't clear announcements outbox", exc_info=e)
+
+    def schedule_outbox_retry(self) -> None:
+        if self.outbox_retry is not None:
+            return
+
+        delay = config.settings.announcements_outbox_retry
+        logger.info(f"Retrying to mark posts as posted in {delay} s")
+        self.outbox_retry = asyncio.get_running_loop().call_later(
+            delay, self.request_outbox_flush
+        )
 
     async def download_facebook_posts(self) -> FacebookPosts:
         logger.debug("Downloading facebook posts")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.bot.settings.scraping_service_url}posts/unposted"
-                )
+            await self.flush_outbox()
+            raw_posts = await self.scraper.get_unposted()
         except httpx.RequestError as e:
             logger.warning("Couldn't reach scraper", exc_info=e)
             raw_posts = []
-        else:
-            try:
-                raw_posts = response.json().get("data", [])
-                logger.info(f"Got {len(raw_posts)} posts")
-            except Exception:
-                raw_posts = []
 
         return [FacebookPostScraped(**x) for x in raw_posts]
 
     def cog_unload(self) -> None:
         self.check_for_announcements.stop()
+        if self.outbox_retry is not None:
+            self.outbox_retry.cancel()
+        asyncio.ensure_future(self._close(), loop=self.bot.loop)
+
+    async def _close(self) -> None:
+        if self.outbox_flush_task is not None:
+            await self.outbox_flush_task
+        await self.scraper.aclose()
 
     if config.settings.debug:
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from arpeggio import PTNodeVisitor, visit_parse_tree
 from arpeggio.cleanpeg import ParserPEG
 
@@ -40,7 +42,10 @@ roll = expression ("," expression)* EOF
 """
 
 
-grammar_parser = ParserPEG(grammar, "roll")
+@lru_cache(maxsize=None)
+def get_parser() -> ParserPEG:
+    """Parser is built on the first roll, not when the extension is loaded."""
+    return ParserPEG(grammar, "roll")
 
 
 class DiceVisitor(PTNodeVisitor):
@@ -134,5 +139,5 @@ class DiceVisitor(PTNodeVisitor):
 
 
 def parse(dice: str) -> Roll:
-    tree = grammar_parser.parse(dice)
+    tree = get_parser().parse(dice)
     return visit_parse_tree(tree, DiceVisitor())
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import json
 import logging
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Mapping
 
-from disnake import Embed
+from disnake import Embed, Locale
 from disnake.ext import commands
 from disnake.interactions.application_command import ApplicationCommandInteraction
 from disnake.types.embed import Embed as EmbedData
@@ -12,13 +14,164 @@ from robomania.bot import Robomania
 from robomania.config import settings
 from robomania.utils.assets import get_asset_url
 
+if TYPE_CHECKING:
+    from robomania.bot import Translator
+
 logger = logging.getLogger("robomania.cogs.info")
 ZRZUTKA_URL = "https://zrzutka.pl/6eh5d2"
 
 
+def fundraiser_embed(tr: Translator) -> EmbedData:
+    return {
+        "title": tr("INFO_FUNDRAISER_TITLE"),
+        "color": 0xE83E3E,
+        "thumbnail": {"url": get_asset_url("zrzutka-icon.png", "icon")},
+        "url": ZRZUTKA_URL,
+        "description": tr("INFO_FUNDRAISER_TEXT"),
+        "fields": [{"name": "Zrzutka", "value": ZRZUTKA_URL}],
+    }
+
+
+def legal_advice_embed(tr: Translator) -> EmbedData:
+    return {
+        "title": tr("LEGAL_ADVICE_TITLE"),
+        "description": tr("LEGAL_ADVICE_TEXT"),
+        "color": 0x2F89DE,
+        "fields": [{"name": "Email", "value": "pomoc.prawna@znakirownosci.org.pl"}],
+    }
+
+
+def address_embed(tr: Translator) -> EmbedData:
+    return {
+        "title": tr("ADDRESS_TITLE"),
+        "description": tr("ADDRESS_TEXT"),
+        "color": 0xBA41D5,
+        "fields": [
+            {
+                "name": tr("ADDRESS_ADDRESS_TITLE"),
+                "value": "ul.Czyżówka 43,\n30-526 Kraków",
+            },
+            {
+                "name": "Google Maps",
+                "value": (
+                    "https://www.google.com/maps/place/Czy%C5%BC%C3%B3wka+43,"
+                    "+30-526+Krak%C3%B3w,+Poland/@50.035777,19.943018,17z/data="
+                    "!4m6!3m5!1s0x47165b5f325388e5:0x645c3382760092d6!8m2!3d50."
+                    "0357772!4d19.943018!16s%2Fg%2F11c1zl8yv_?hl=pl-PL"
+                ),
+            },
+            {
+                "name": tr("ADDRESS_PUBLIC_TRANSPORT_TITLE"),
+                "value": tr("ADDRESS_PUBLIC_TRANSPORT_VALUE"),
+            },
+        ],
+    }
+
+
+def fanimani_embed(tr: Translator) -> EmbedData:
+    return {
+        "title": "Fanimani",
+        "description": tr("FANIMANI_TEXT"),
+        "color": 0xFF294E,
+        "url": "https://fanimani.pl/domeq/",
+        "fields": [
+            {
+                "name": "Federacja Znaki Równości na Fanimani",
+                "value": "https://fanimani.pl/domeq/",
+                "inline": True,
+            },
+        ],
+    }
+
+
+def support_embed(tr: Translator) -> EmbedData:
+    return {
+        "title": tr("SUPPORT_TITLE"),
+        "description": tr("SUPPORT_TEXT"),
+        "color": 0x5ED2FE,
+        "fields": [
+            {"name": "Fanimani", "value": "https://fanimani.pl/domeq/"},
+            {"name": "Zrzutka.pl", "value": ZRZUTKA_URL},
+            {
+                "name": tr("SUPPORT_TRANSFER_TITLE"),
+                "value": tr("SUPPORT_TRANSFER_TEXT"),
+            },
+        ],
+    }
+
+
+def contact_embed(tr: Translator) -> EmbedData:
+    return {
+        "title": tr("CONTACT_TITLE"),
+        "description": tr("CONTACT_TEXT"),
+        "color": 0xC4FF39,
+        "fields": [
+            {
+                "name": tr("CONTACT_SIGNS_OF_EQUALITY_TITLE"),
+                "value": "kontakt@znakirownosci.org.pl",
+            },
+            {
+                "name": "Krakowskie Centrum Równości DOM EQ",
+                "value": "domeq@znakirownosci.org.pl",
+            },
+            {
+                "name": tr("CONTACT_LEGAL_TEAM_TITLE"),
+                "value": "pomoc.prawna@znakirownosci.org.pl",
+            },
+            {
+                "name": tr("CONTACT_PSYCHO_TEAM_TITLE"),
+                "value": "wsparcie@znakirownosci.org.pl",
+            },
+        ],
+    }
+
+
+def why_was_marianna_late_embed(tr: Translator) -> EmbedData:
+    return {
+        "title": tr("WHY_MARRIANNA_LATE_TITLE"),
+        "color": 0xFF18F7,
+        "image": {
+            "url": get_asset_url("139-kombinat.png", "image"),
+        },
+    }
+
+
+EMBED_BUILDERS: dict[str, Callable[[Translator], EmbedData]] = {
+    "fundraiser": fundraiser_embed,
+    "legal_advice": legal_advice_embed,
+    "address": address_embed,
+    "fanimani": fanimani_embed,
+    "support": support_embed,
+    "contact": contact_embed,
+    "why_was_marianna_late": why_was_marianna_late_embed,
+}
+
+
 class Info(commands.Cog):
+    embeds: Mapping[tuple[str, Locale], Embed]
+
     def __init__(self, bot: Robomania):
         self.bot = bot
+        self.build_embeds()
+
+    @staticmethod
+    def get_locales() -> set[Locale]:
+        return {Robomania.resolve_locale(i) for i in Locale}
+
+    def build_embeds(self) -> None:
+        """Build embeds for every locale, they don't change between calls."""
+        embeds = {}
+        for locale in self.get_locales():
+            with Robomania.localize(locale) as tr:
+                for name, builder in EMBED_BUILDERS.items():
+                    embeds[name, locale] = Embed.from_dict(builder(tr))
+
+        self.embeds = MappingProxyType(embeds)
+        logger.debug(f"Built {len(embeds)} info embeds")
+
+    @commands.Cog.listener()
+    async def on_locale_reload(self) -> None:
+        self.build_embeds()
 
     @commands.slash_command()
     async def info(
@@ -27,10 +180,10 @@ class Info(commands.Cog):
     ):
         """Display various informations  {{ DISPLAY_INFO }}"""
 
-    async def send_embed(
-        self, inter: ApplicationCommandInteraction, embed: EmbedData
-    ) -> None:
-        await inter.send(embed=Embed.from_dict(embed))
+    async def send_embed(self, inter: ApplicationCommandInteraction, name: str) -> None:
+        locale = Robomania.resolve_locale(inter.locale)
+        # Hand out a copy, so nothing down the line can modify the cached embed.
+        await inter.send(embed=self.embeds[name, locale].copy())
 
     @info.sub_command()
     async def fundraiser(self, inter: ApplicationCommandInteraction) -> None:
@@ -41,18 +194,7 @@ class Info(commands.Cog):
         inter : :class:`ApplicationCommandInteraction`
             Command interaction
         """
-        with Robomania.localize(inter.locale) as tr:
-            await self.send_embed(
-                inter,
-                {
-                    "title": tr("INFO_FUNDRAISER_TITLE"),
-                    "color": 0xE83E3E,
-                    "thumbnail": {"url": get_asset_url("zrzutka-icon.png", "icon")},
-                    "url": ZRZUTKA_URL,
-                    "description": tr("INFO_FUNDRAISER_TEXT"),
-                    "fields": [{"name": "Zrzutka", "value": ZRZUTKA_URL}],
-                },
-            )
+        await self.send_embed(inter, "fundraiser")
 
     @info.sub_command()
     async def legal_advice(self, inter: ApplicationCommandInteraction) -> None:
@@ -63,18 +205,7 @@ class Info(commands.Cog):
         inter : :class:`ApplicationCommandInteraction`
             Command interaction
         """
-        with Robomania.localize(inter.locale) as tr:
-            await self.send_embed(
-                inter,
-                {
-                    "title": tr("LEGAL_ADVICE_TITLE"),
-                    "description": tr("LEGAL_ADVICE_TEXT"),
-                    "color": 0x2F89DE,
-                    "fields": [
-                        {"name": "Email", "value": "pomoc.prawna@znakirownosci.org.pl"}
-                    ],
-                },
-            )
+        await self.send_embed(inter, "legal_advice")
 
     @info.sub_command()
     async def address(self, inter: ApplicationCommandInteraction) -> None:
@@ -86,34 +217,7 @@ class Info(commands.Cog):
         inter : :class:`ApplicationCommandInteraction`
             Command interaction
         """
-        with Robomania.localize(inter.locale) as tr:
-            await self.send_embed(
-                inter,
-                {
-                    "title": tr("ADDRESS_TITLE"),
-                    "description": tr("ADDRESS_TEXT"),
-                    "color": 0xBA41D5,
-                    "fields": [
-                        {
-                            "name": tr("ADDRESS_ADDRESS_TITLE"),
-                            "value": "ul.Czyżówka 43,\n30-526 Kraków",
-                        },
-                        {
-                            "name": "Google Maps",
-                            "value": (
-                                "https://www.google.com/maps/place/Czy%C5%BC%C3%B3wka+43,"
-                                "+30-526+Krak%C3%B3w,+Poland/@50.035777,19.943018,17z/data="
-                                "!4m6!3m5!1s0x47165b5f325388e5:0x645c3382760092d6!8m2!3d50."
-                                "0357772!4d19.943018!16s%2Fg%2F11c1zl8yv_?hl=pl-PL"
-                            ),
-                        },
-                        {
-                            "name": tr("ADDRESS_PUBLIC_TRANSPORT_TITLE"),
-                            "value": tr("ADDRESS_PUBLIC_TRANSPORT_VALUE"),
-                        },
-                    ],
-                },
-            )
+        await self.send_embed(inter, "address")
 
     @info.sub_command()
     async def fanimani(self, inter: ApplicationCommandInteraction) -> None:
@@ -124,23 +228,7 @@ class Info(commands.Cog):
         inter : :class:`ApplicationCommandInteraction`
             Command interaction
         """
-        with Robomania.localize(inter.locale) as tr:
-            await self.send_embed(
-                inter,
-                {
-                    "title": "Fanimani",
-                    "description": tr("FANIMANI_TEXT"),
-                    "color": 0xFF294E,
-                    "url": "https://fanimani.pl/domeq/",
-                    "fields": [
-                        {
-                            "name": "Federacja Znaki Równości na Fanimani",
-                            "value": "https://fanimani.pl/domeq/",
-                            "inline": True,
-                        },
-                    ],
-                },
-            )
+        await self.send_embed(inter, "fanimani")
 
     @info.sub_command()
     async def support(self, inter: ApplicationCommandInteraction) -> None:
@@ -152,23 +240,7 @@ class Info(commands.Cog):
         inter : :class:`ApplicationCommandInteraction`
             Command interaction
         """
-        with Robomania.localize(inter.locale) as tr:
-            await self.send_embed(
-                inter,
-                {
-                    "title": tr("SUPPORT_TITLE"),
-                    "description": tr("SUPPORT_TEXT"),
-                    "color": 0x5ED2FE,
-                    "fields": [
-                        {"name": "Fanimani", "value": "https://fanimani.pl/domeq/"},
-                        {"name": "Zrzutka.pl", "value": ZRZUTKA_URL},
-                        {
-                            "name": tr("SUPPORT_TRANSFER_TITLE"),
-                            "value": tr("SUPPORT_TRANSFER_TEXT"),
-                        },
-                    ],
-                },
-            )
+        await self.send_embed(inter, "support")
 
     @info.sub_command()
     async def contact(self, inter: ApplicationCommandInteraction) -> None:
@@ -179,33 +251,7 @@ class Info(commands.Cog):
         inter : :class:`ApplicationCommandInteraction`
             Command interaction
         """
-        with Robomania.localize(inter.locale) as tr:
-            await self.send_embed(
-                inter,
-                {
-                    "title": tr("CONTACT_TITLE"),
-                    "description": tr("CONTACT_TEXT"),
-                    "color": 0xC4FF39,
-                    "fields": [
-                        {
-                            "name": tr("CONTACT_SIGNS_OF_EQUALITY_TITLE"),
-                            "value": "kontakt@znakirownosci.org.pl",
-                        },
-                        {
-                            "name": "Krakowskie Centrum Równości DOM EQ",
-                            "value": "domeq@znakirownosci.org.pl",
-                        },
-                        {
-                            "name": tr("CONTACT_LEGAL_TEAM_TITLE"),
-                            "value": "pomoc.prawna@znakirownosci.org.pl",
-                        },
-                        {
-                            "name": tr("CONTACT_PSYCHO_TEAM_TITLE"),
-                            "value": "wsparcie@znakirownosci.org.pl",
-                        },
-                    ],
-                },
-            )
+        await self.send_embed(inter, "contact")
 
     @info.sub_command()
     async def why_was_marianna_late(self, inter: ApplicationCommandInteraction) -> None:
@@ -216,17 +262,7 @@ class Info(commands.Cog):
         inter : :class:`ApplicationCommandInteraction`
             Command interaction
         """
-        with Robomania.localize(inter.locale) as tr:
-            await self.send_embed(
-                inter,
-                {
-                    "title": tr("WHY_MARRIANNA_LATE_TITLE"),
-                    "color": 0xFF18F7,
-                    "image": {
-                        "url": get_asset_url("139-kombinat.png", "image"),
-                    },
-                },
-            )
+        await self.send_embed(inter, "why_was_marianna_late")
 
     if settings.debug:
 
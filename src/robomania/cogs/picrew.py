@@ -13,7 +13,7 @@ from disnake.interactions.application_command import ApplicationCommandInteracti
 from robomania import config
 from robomania.bot import Robomania
 from robomania.models.picrew_model import PicrewModel
-from robomania.types.post import PostOld
+from robomania.types.message import MarkdownEscapingTextProcessor, MessageBuilder
 from robomania.utils.exceptions import DuplicateError
 
 logger = logging.getLogger("robomania.cogs.picrew")
@@ -21,7 +21,7 @@ logger = logging.getLogger("robomania.cogs.picrew")
 
 class PicrewPost:
     picrew_info: PicrewModel
-    post: PostOld
+    message: MessageBuilder
     mentions = AllowedMentions(users=False)
 
     def __init__(self, info: PicrewModel) -> None:
@@ -36,20 +36,20 @@ class PicrewPost:
         if info.tw:
             tw = f"TW: {info.tw}\n"
 
-        post_text = (
-            f"{self.picrew_info.link}\n{tw}"
-            f'{Robomania.tr("PICREW_POST_ADDED_BY", "Post added by")}: '
-            f"{user_mention}"
+        post_text = Robomania.template("PICREW_POST_TEMPLATE").render(
+            link=self.picrew_info.link, tw=tw, user=user_mention
         )
 
-        self.post = PostOld(post_text)
+        # Link preview is the point of the post, so embeds aren't suppressed.
+        self.message = MessageBuilder(
+            MarkdownEscapingTextProcessor(), self.mentions
+        ).text_with_images_message(post_text, [], suppress_embeds=False)
 
     async def send(self, channel: disnake.TextChannel) -> None:
-        await self.post.send(channel, allowed_mentions=self.mentions)
+        await self.message.send(channel)
 
     async def respond(self, inter: ApplicationCommandInteraction) -> None:
-        text = self.post.text
-        await inter.send(text, allowed_mentions=self.mentions)
+        await self.message.send(inter)
 
 
 class Picrew(commands.Cog):
@@ -130,11 +130,7 @@ class Picrew(commands.Cog):
             count = await PicrewModel.count_posted_and_not_posted(db)
 
             await inter.followup.send(
-                Robomania.tr(
-                    "PICREW_STATS",
-                    "There are {links_waiting} links still waiting to be sent."
-                    " At this time {links_sent} links were sent.",
-                ).format(
+                Robomania.template("PICREW_STATS").render(
                     links_waiting=count.not_posted,
                     links_sent=count.posted,
                 )
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import pytesseract as tes
 from disnake.ext import commands
 from PIL import Image, ImageDraw, ImageOps
 
@@ -22,6 +21,8 @@ class Planner:
         return high_contrast
 
     def read_text_from_image(self, img: Image.Image) -> str:
+        import pytesseract as tes
+
         processed_img = self.process_img(img)
 
         return tes.image_to_string(processed_img, lang="pol")
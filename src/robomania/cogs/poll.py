@@ -1,13 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import enum
 import logging
 import random
+import time
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING
 
-from disnake import AllowedMentions, Localised, Member, OptionChoice
-from disnake.ext import commands
+from disnake import (
+    AllowedMentions,
+    Locale,
+    Localised,
+    Member,
+    OptionChoice,
+    RawReactionActionEvent,
+)
+from disnake.ext import commands, tasks
 from disnake.interactions.application_command import ApplicationCommandInteraction
+from pymongo.errors import PyMongoError
+
+from robomania import config
+from robomania.models.poll_model import PollModel
+from robomania.utils.reactions import reaction_applier
 
 if TYPE_CHECKING:
     from disnake import Role
@@ -45,6 +60,8 @@ class DomeqPronounsRoles(enum.IntEnum):
                 return ""
 
 
+DOMEQ_PRONOUNS_ROLES = frozenset(DomeqPronounsRoles)
+
 emotes = {
     "numbers": ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"],
     "hearts": ["💚", "❤️", "💙", "🧡", "💜", "❤️‍🩹", "💞", "🤍", "💛", "🫀"],
@@ -54,8 +71,156 @@ emotes = {
 
 
 class Poll(commands.Cog):
+    polls: dict[int, PollModel]
+    dirty: set[int]
+    close_tasks: dict[int, asyncio.Task]
+
     def __init__(self, bot: Robomania):
         self.bot = bot
+        self.polls = {}
+        self.dirty = set()
+        self.close_tasks = {}
+
+    async def cog_load(self) -> None:
+        try:
+            polls = await PollModel.get_open(
+                self.bot.get_db("robomania"), self.open_ended_since()
+            )
+        except PyMongoError as e:
+            logger.error("Couldn't restore open polls", exc_info=e)
+            polls = []
+
+        for poll in polls:
+            self.track(poll)
+        logger.info(f"Restored {len(polls)} open polls")
+
+        self.snapshot_polls.start()
+
+    def cog_unload(self) -> None:
+        self.snapshot_polls.stop()
+        for task in self.close_tasks.values():
+            task.cancel()
+        asyncio.ensure_future(self.save_dirty_polls(), loop=self.bot.loop)
+
+    def track(self, poll: PollModel) -> None:
+        self.polls[poll.message_id] = poll
+        if poll.closes_at is not None:
+            self.close_tasks[poll.message_id] = asyncio.create_task(
+                self.close_poll_at(poll)
+            )
+
+    async def add_poll(self, poll: PollModel) -> None:
+        """Track a new poll and save it right away, so it survives a restart
+        before the next snapshot.
+        """
+        self.track(poll)
+        try:
+            await poll.save(self.bot.get_db("robomania"))
+        except PyMongoError as e:
+            logger.warning(f"Couldn't save new poll {poll.message_id}", exc_info=e)
+            self.dirty.add(poll.message_id)
+
+    @staticmethod
+    def open_ended_since() -> datetime:
+        return datetime.now(timezone.utc) - timedelta(
+            seconds=config.settings.poll_open_ended_ttl
+        )
+
+    @tasks.loop(seconds=config.settings.poll_snapshot_interval)
+    async def snapshot_polls(self) -> None:
+        await self.save_dirty_polls()
+        self.drop_expired_polls()
+
+    def drop_expired_polls(self) -> None:
+        """Stop tallying polls without a duration, that are past their TTL."""
+        since = self.open_ended_since()
+        expired = [
+            i
+            for i in self.polls.values()
+            if i.closes_at is None
+            and i.created_at < since
+            and i.message_id not in self.dirty
+        ]
+        for poll in expired:
+            del self.polls[poll.message_id]
+
+        if expired:
+            logger.info(f"Stopped tracking {len(expired)} open-ended polls")
+
+    async def save_dirty_polls(self) -> None:
+        db = self.bot.get_db("robomania")
+        to_save, self.dirty = self.dirty, set()
+
+        for message_id in to_save:
+            try:
+                await self.polls[message_id].save(db)
+            except KeyError:
+                continue
+            except PyMongoError as e:
+                logger.warning(f"Couldn't save poll {message_id}", exc_info=e)
+                self.dirty.add(message_id)
+
+    def update_tally(self, payload: RawReactionActionEvent, add: bool) -> None:
+        poll = self.polls.get(payload.message_id)
+        if poll is None or (
+            self.bot.user is not None and payload.user_id == self.bot.user.id
+        ):
+            return
+
+        emoji = str(payload.emoji)
+        if add:
+            changed = poll.vote(emoji, payload.user_id)
+        else:
+            changed = poll.unvote(emoji, payload.user_id)
+
+        if changed:
+            self.dirty.add(poll.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: RawReactionActionEvent) -> None:
+        self.update_tally(payload, True)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: RawReactionActionEvent) -> None:
+        self.update_tally(payload, False)
+
+    async def close_poll_at(self, poll: PollModel) -> None:
+        assert poll.closes_at is not None
+        delay = (poll.closes_at - datetime.now(timezone.utc)).total_seconds()
+        await asyncio.sleep(max(delay, 0))
+        await self.bot.wait_until_ready()
+        await self.close_poll(poll)
+
+    async def close_poll(self, poll: PollModel) -> None:
+        poll.closed = True
+        self.polls.pop(poll.message_id, None)
+        self.close_tasks.pop(poll.message_id, None)
+        self.dirty.discard(poll.message_id)
+
+        try:
+            await poll.save(self.bot.get_db("robomania"))
+        except PyMongoError as e:
+            logger.warning(f"Couldn't save closed poll {poll.message_id}", exc_info=e)
+
+        with self.bot.localize(Locale(poll.locale)):
+            results = self.bot.template("POLL_RESULTS_TEMPLATE").render(
+                question=poll.question
+            )
+
+        results += "\n---\n" + "\n".join(
+            f"{emote} {option.strip()}: {count}"
+            for emote, option, count in zip(poll.emojis, poll.options, poll.counts)
+        )
+
+        channel = self.bot.get_partial_messageable(
+            poll.channel_id, guild_id=poll.guild_id
+        )
+        await channel.get_partial_message(poll.message_id).reply(
+            results,
+            suppress_embeds=True,
+            allowed_mentions=AllowedMentions.none(),
+        )
+        logger.info(f"Closed poll {poll.message_id} with votes {poll.counts}")
 
     @commands.slash_command()
     async def poll(
@@ -74,6 +239,7 @@ class Poll(commands.Cog):
                 OptionChoice(Localised("yes no", key="POLL_OPTION_YES_NO"), "yes no"),
             ],
         ),
+        duration: int = commands.Param(default=0, ge=0),
     ):
         """Create a poll  {{ POLL_CREATE }}
 
@@ -90,22 +256,29 @@ class Poll(commands.Cog):
         theme : str
             Style of reactions for options
             {{ POLL_REACTIONS }}
+        duration : int
+            Minutes after which the poll is closed, 0 keeps it open
+            {{ POLL_DURATION }}
         """
-        logger.info(f"Requested new poll: {question=}, {options=}, {theme=}")
+        logger.info(
+            f"Requested new poll: {question=}, {options=}, {theme=}, {duration=}"
+        )
+        start = time.perf_counter()
         if isinstance(theme, enum.Enum):
             theme = theme.value
 
         selected_theme = emotes[theme]
         separated_options = options.split("|")
-        with self.bot.localize(
-            ("COMMUNITY" in inter.guild.features and inter.guild_locale) or inter.locale
-        ) as tr:
+        locale = (
+            "COMMUNITY" in inter.guild.features and inter.guild_locale
+        ) or inter.locale
+        with self.bot.localize(locale) as tr:
             if len(separated_options) > len(selected_theme):
                 logger.info(
                     "Failed to create poll with selected theme, " "too many options"
                 )
                 await inter.send(
-                    tr("POLL_TOO_MANY_OPTIONS").format(
+                    self.bot.template("POLL_TOO_MANY_OPTIONS").render(
                         num_of_options=len(selected_theme)
                     ),
                     ephemeral=True,
@@ -113,30 +286,27 @@ class Poll(commands.Cog):
                 return
 
             message_arguments = {"user": inter.user.mention, "question": question}
+            message_template_key = "POLL_CREATE_MESSAGE_TEMPLATE"
 
             if inter.guild_id == 688337005402128386:
                 if isinstance(inter.user, Member):
                     user_roles = inter.user.roles
                 else:
                     user_roles = []
-                roles_in_domeq = list(DomeqPronounsRoles)
-                pronouns: list[Role] = [i for i in user_roles if i.id in roles_in_domeq]
+                pronouns: list[Role] = [
+                    i for i in user_roles if i.id in DOMEQ_PRONOUNS_ROLES
+                ]
                 if pronouns:
                     selected_pronouns = DomeqPronounsRoles(pronouns[-1].id)
-                    t = selected_pronouns.get_translation_key()
-                    if not t:
-                        message_template_key = "POLL_CREATE_MESSAGE_TEMPLATE"
-                    else:
+                    if t := selected_pronouns.get_translation_key():
                         message_template_key = (
-                            "POLL_CREATE_MESSAGE_WITH_PRONOUNS_TEMPLATE"  # noqa: E501
+                            "POLL_CREATE_MESSAGE_WITH_PRONOUNS_TEMPLATE"
                         )
                         message_arguments["created"] = tr(t, "")
 
-                    message_template = tr(message_template_key, "")
-            else:
-                message_template = tr("POLL_CREATE_MESSAGE_TEMPLATE", "")
-
-            message = message_template.format_map(message_arguments)
+            message = self.bot.template(message_template_key).render(
+                **message_arguments
+            )
 
             message += "\n---\n" + "\n".join(
                 f"{emote}: {option.strip()}"
@@ -149,8 +319,29 @@ class Poll(commands.Cog):
                 allowed_mentions=AllowedMentions(users=False),
             )
             response = await inter.original_response()
-            for emote in selected_theme[: len(separated_options)]:
-                await response.add_reaction(emote)
+            poll_emotes = selected_theme[: len(separated_options)]
+
+            poll = PollModel(
+                response.id,
+                response.channel.id,
+                inter.guild_id,
+                locale.value,
+                question,
+                [i.strip() for i in separated_options],
+                poll_emotes,
+                closes_at=(
+                    datetime.now(timezone.utc) + timedelta(minutes=duration)
+                    if duration
+                    else None
+                ),
+            )
+            await self.add_poll(poll)
+
+            reactions_time = await reaction_applier.add_reactions(response, poll_emotes)
+            logger.info(
+                f"Poll set up in {(time.perf_counter() - start) * 1000:.0f} ms, "
+                f"reactions took {reactions_time * 1000:.0f} ms"
+            )
 
 
 def setup(bot: Robomania):
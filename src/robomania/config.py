@@ -8,6 +8,7 @@ import disnake
 from pydantic import (
     AnyHttpUrl,
     BaseSettings,
+    DirectoryPath,
     Extra,
     Field,
     MongoDsn,
@@ -31,6 +32,17 @@ class Settings(BasicSettings):
     db_port: str | None = None
 
     db_url: MongoDsn | None = None
+    db_max_pool_size: int = 100
+    db_min_pool_size: int = 0
+    db_max_idle_time_ms: int | None = None
+    # Opt-in, e.g. ("zstd", "snappy", "zlib"). Compressors, that aren't
+    # installed, are skipped.
+    db_compressors: tuple[str, ...] = ()
+    db_read_preference: str = "primary"
+    db_sync_max_pool_size: int = 4
+    db_sync_min_pool_size: int = 0
+
+    skip_unchanged_command_sync: bool = True
 
     @validator("db_url")
     def validate_url(
@@ -64,12 +76,32 @@ class Settings(BasicSettings):
     scraper_user_agent: str | None = None
     facebook_cookies_path: Path
     log_folder: Path
+    log_json: bool = False
+    # Rotation by size, unless `log_rotate_when` (e.g. "midnight") is set.
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 5
+    log_rotate_when: str | None = None
+    # Fraction of records below ERROR kept per logger, e.g. {"disnake.gateway": 0.1}.
+    log_sampling: dict[str, float] = {}
 
     announcements_target_channel: int
     picrew_target_channel: int
     scraping_service_url: str = ""
+    scraper_timeout: float = 30
+    scraper_connect_timeout: float = 5
+    scraper_max_connections: int = 10
+    scraper_max_keepalive_connections: int = 5
+    scraper_keepalive_expiry: float = 900
 
     time_betweent_announcements_check: int = 10
+    announcements_prefetch: int = 3
+    announcements_outbox_retry: float = 30
+    poll_snapshot_interval: float = 60
+    # Polls without a duration are tallied for this many seconds after creation.
+    poll_open_ended_ttl: float = 7 * 24 * 60 * 60
+
+    loop_lag_threshold: float = 0.25
+    healthcheck_max_loop_lag: float = 1
 
     assets_base_url: AnyHttpUrl
 
@@ -79,9 +111,17 @@ class Settings(BasicSettings):
         "robomania.cogs.dice",
         "robomania.cogs.poll",
         "robomania.cogs.info",
+        "robomania.cogs.admin",
     )
+    # Guilds, where owner-only maintenance commands are registered.
+    admin_guild_ids: tuple[int, ...] = (958823316850880512,)
 
     default_locale = disnake.Locale.en_GB
+    # Directory with locale files, that replaces the packaged one.
+    locale_path: DirectoryPath | None = None
+    # Only an overriding `locale_path` is watched, packaged files don't change
+    # while the bot runs. None disables the watcher.
+    locale_watch_interval: float | None = 5
 
     available_locales: tuple[str, ...] = (
         "pl",
@@ -1,8 +1,33 @@
+from __future__ import annotations
+
+import json
 import logging
+from pathlib import Path
+from string import Formatter
+from typing import Any, Callable, Iterable, Mapping
+
+import disnake
+
+from robomania.utils.exceptions import TemplateError
+
+Localizations = dict[str, dict[str, str]]
+TranslationTable = dict[tuple[disnake.Locale, str], str]
 
 logger = logging.getLogger("robomania.locale")
 
 
+# Placeholders, that each template is rendered with.
+TEMPLATES: dict[str, tuple[str, ...]] = {
+    "POLL_CREATE_MESSAGE_TEMPLATE": ("user", "question"),
+    "POLL_CREATE_MESSAGE_WITH_PRONOUNS_TEMPLATE": ("user", "created", "question"),
+    "POLL_TOO_MANY_OPTIONS": ("num_of_options",),
+    "POLL_RESULTS_TEMPLATE": ("question",),
+    "PICREW_STATS": ("links_waiting", "links_sent"),
+    "PICREW_POST_TEMPLATE": ("link", "tw", "user"),
+}
+CONVERSIONS = {"r": "repr", "s": "str", "a": "ascii"}
+
+
 class DefaultLocaleMetaclass(type):
     def __getitem__(cls, name: str) -> str:
         return cls.__dict__[name]
@@ -25,6 +50,17 @@ class DefaultLocale(metaclass=DefaultLocaleMetaclass):
 
     POLL_TOO_MANY_OPTIONS = "Only 10 options can be passed."
     POLL_CREATE_MESSAGE_TEMPLATE = '{user} created a poll: "{question}"'
+    POLL_RESULTS_TEMPLATE = 'Poll "{question}" has ended. Results:'
+
+    PICREW_STATS = (
+        "There are {links_waiting} links still waiting to be sent."
+        " At this time {links_sent} links were sent."
+    )
+    PICREW_POST_TEMPLATE = "{link}\n{tw}Post added by: {user}"
+
+    @classmethod
+    def items(cls) -> dict[str, str]:
+        return {k: v for k, v in vars(cls).items() if k.isupper()}
 
     @classmethod
     def get(cls, name: str) -> str:
@@ -35,3 +71,129 @@ class DefaultLocale(metaclass=DefaultLocaleMetaclass):
             return name
 
         return out
+
+
+def load_localizations(path: Path) -> Localizations:
+    """Read locale files into key -> {locale: value}, the way
+    `disnake.LocalizationStore` does.
+    """
+    out: Localizations = {}
+
+    for file in sorted(path.glob("*.json")):
+        locale = disnake.utils.as_valid_locale(file.stem)
+        if locale is None:
+            logger.warning(f'Skipping locale file with invalid name: "{file}"')
+            continue
+
+        data = json.loads(file.read_text("utf-8"))
+        for key, value in data.items():
+            if value is not None:
+                out.setdefault(key, {})[locale] = value
+
+    return out
+
+
+def locale_signature(path: Path) -> tuple[tuple[str, int, int], ...]:
+    """Names, modification times and sizes of locale files, to notice edits."""
+    out = []
+    for file in sorted(path.glob("*.json")):
+        stat = file.stat()
+        out.append((file.name, stat.st_mtime_ns, stat.st_size))
+
+    return tuple(out)
+
+
+def compile_translations(
+    localizations: Mapping[str, Mapping[str, str]], locales: Iterable[disnake.Locale]
+) -> TranslationTable:
+    """Flatten localizations into (locale, key) -> value, with `DefaultLocale`
+    filling the missing keys.
+    """
+    defaults = DefaultLocale.items()
+    table: TranslationTable = {}
+
+    for locale in locales:
+        for key, value in defaults.items():
+            table[locale, key] = value
+
+        for key, values in localizations.items():
+            if (value := values.get(locale.value)) is not None:
+                table[locale, key] = value
+
+    return table
+
+
+class Template:
+    """Template parsed once with `string.Formatter` into a render function,
+    that takes every placeholder as a keyword argument.
+    """
+
+    render: Callable[..., str]
+
+    def __init__(self, text: str, fields: Iterable[str] = ()) -> None:
+        self.text = text
+        self.fields = tuple(fields)
+        self.render = self.compile()
+
+    def compile(self) -> Callable[..., str]:
+        namespace: dict[str, Any] = {}
+        parts = []
+
+        for i, (literal, field, spec, conversion) in enumerate(
+            Formatter().parse(self.text)
+        ):
+            if literal:
+                namespace[f"_literal{i}"] = literal
+                parts.append(f"_literal{i}")
+
+            if field is None:
+                continue
+            if field not in self.fields:
+                raise TemplateError(
+                    f'Unknown placeholder "{field}" in template: {self.text!r}'
+                )
+            if spec and "{" in spec:
+                raise TemplateError(f"Nested placeholders in template: {self.text!r}")
+
+            value = field
+            if conversion:
+                value = f"{CONVERSIONS[conversion]}({value})"
+            if spec:
+                namespace[f"_spec{i}"] = spec
+                parts.append(f"format({value}, _spec{i})")
+            else:
+                parts.append(f"format({value})")
+
+        arguments = f"*, {', '.join(self.fields)}" if self.fields else ""
+        body = " + ".join(parts) or '""'
+        exec(f"def render({arguments}):\n    return {body}", namespace)
+
+        return namespace["render"]
+
+    def __repr__(self) -> str:
+        return f"Template({self.text!r}, {self.fields!r})"
+
+
+TemplateTable = dict[tuple[disnake.Locale, str], Template]
+
+
+def compile_templates(
+    translations: Mapping[tuple[disnake.Locale, str], str],
+    templates: Mapping[str, Iterable[str]] = TEMPLATES,
+) -> TemplateTable:
+    """Parse every translation of registered templates, invalid translations
+    are replaced with `DefaultLocale`.
+    """
+    table: TemplateTable = {}
+
+    for (locale, key), text in translations.items():
+        if (fields := templates.get(key)) is None:
+            continue
+
+        try:
+            table[locale, key] = Template(text, fields)
+        except TemplateError as e:
+            logger.error(f'Invalid "{key}" template for "{locale}" locale: {e}')
+            table[locale, key] = Template(DefaultLocale.get(key), fields)
+
+    return table
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from robomania.bot import Robomania
+from robomania.models.announcement_outbox import AnnouncementOutbox
+from robomania.models.command_sync import CommandSyncState
 from robomania.models.model import CollectionSetup
 from robomania.models.picrew_model import PicrewModel
+from robomania.models.poll_model import PollModel
 
 models = [
     PicrewModel,
+    AnnouncementOutbox,
+    PollModel,
+    CommandSyncState,
 ]
 
 
@@ -14,9 +20,8 @@ __all__ = [i.__name__ for i in models]
 
 def create_collections() -> None:
     bot = Robomania.get_bot()
-    with bot.blocking_db():
-        db = bot.get_db("robomania")
+    db = bot.get_db("robomania", blocking=True)
 
-        for i in models:
-            if isinstance(i, CollectionSetup):
-                i.create_collections(db)
+    for i in models:
+        if isinstance(i, CollectionSetup):
+            i.create_collections(db)
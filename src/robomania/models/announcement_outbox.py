@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Awaitable, Iterable, cast
+
+if TYPE_CHECKING:
+    from pymongo.database import Database
+
+
+class AnnouncementOutbox:
+    """Posts, that were sent, but weren't yet marked as posted in the scraper."""
+
+    @staticmethod
+    async def add(db: Database, post_id: str) -> None:
+        await cast(
+            Awaitable,
+            db.announcements_outbox.update_one(
+                {"_id": post_id},
+                {"$setOnInsert": {"sent_at": datetime.now()}},
+                upsert=True,
+            ),
+        )
+
+    @staticmethod
+    async def pending(db: Database) -> list[str]:
+        cursor = db.announcements_outbox.find({}, {"_id": 1}).sort("sent_at", 1)
+        return [i["_id"] async for i in cursor]  # type: ignore
+
+    @staticmethod
+    async def remove(db: Database, post_ids: Iterable[str]) -> None:
+        await cast(
+            Awaitable,
+            db.announcements_outbox.delete_many({"_id": {"$in": list(post_ids)}}),
+        )
+
+    @staticmethod
+    def create_collections(db: Database) -> None:
+        import pymongo
+
+        col = db.announcements_outbox
+        col.create_index([("sent_at", pymongo.ASCENDING)])
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Awaitable, cast
+
+if TYPE_CHECKING:
+    from pymongo.database import Database
+
+
+class CommandSyncState:
+    """Hash of the application commands, that were last synced per application."""
+
+    @staticmethod
+    async def get_hash(db: Database, application_id: int) -> str | None:
+        document = await cast(
+            Awaitable, db.command_sync.find_one({"_id": application_id})
+        )
+        return document["hash"] if document else None
+
+    @staticmethod
+    async def set_hash(db: Database, application_id: int, payload_hash: str) -> None:
+        await cast(
+            Awaitable,
+            db.command_sync.replace_one(
+                {"_id": application_id},
+                {"hash": payload_hash, "synced_at": datetime.now()},
+                upsert=True,
+            ),
+        )
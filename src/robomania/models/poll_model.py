@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Awaitable, cast
+
+import disnake
+from attrs import asdict, define, field
+
+from robomania.models.model import Model
+
+if TYPE_CHECKING:
+    from pymongo.database import Database
+
+
+@define
+class PollModel(Model):
+    """Poll with votes tallied from reaction events.
+
+    Voters are kept per option, so replayed or duplicated events don't
+    change the result.
+    """
+
+    message_id: int
+    channel_id: int
+    guild_id: int | None
+    locale: str
+    question: str
+    options: list[str]
+    emojis: list[str]
+    closes_at: datetime | None = field(default=None)
+    closed: bool = field(default=False)
+    voters: list[set[int]] = field(default=None)
+
+    def __attrs_post_init__(self) -> None:
+        if self.voters is None:
+            self.voters = [set() for _ in self.options]
+
+    def _option_index(self, emoji: str) -> int | None:
+        try:
+            return self.emojis.index(emoji)
+        except ValueError:
+            return None
+
+    def vote(self, emoji: str, user_id: int) -> bool:
+        index = self._option_index(emoji)
+        if index is None or self.closed or user_id in self.voters[index]:
+            return False
+
+        self.voters[index].add(user_id)
+        return True
+
+    def unvote(self, emoji: str, user_id: int) -> bool:
+        index = self._option_index(emoji)
+        if index is None or self.closed or user_id not in self.voters[index]:
+            return False
+
+        self.voters[index].discard(user_id)
+        return True
+
+    @property
+    def created_at(self) -> datetime:
+        return disnake.utils.snowflake_time(self.message_id)
+
+    @property
+    def counts(self) -> list[int]:
+        return [len(i) for i in self.voters]
+
+    def to_dict(self) -> dict[str, Any]:
+        out = asdict(self)
+        out["_id"] = out.pop("message_id")
+        out["voters"] = [sorted(i) for i in self.voters]
+
+        return out
+
+    @classmethod
+    def from_raw(cls, data: dict[str, Any]) -> PollModel:
+        data = data.copy()
+        data["message_id"] = data.pop("_id")
+        data["voters"] = [set(i) for i in data["voters"]]
+
+        # Mongo returns naive datetimes in UTC.
+        if (closes_at := data.get("closes_at")) and closes_at.tzinfo is None:
+            data["closes_at"] = closes_at.replace(tzinfo=timezone.utc)
+
+        return cls(**data)
+
+    async def save(self, db: Database) -> None:
+        await cast(
+            Awaitable,
+            db.polls.replace_one({"_id": self.message_id}, self.to_dict(), upsert=True),
+        )
+
+    @classmethod
+    async def get_open(
+        cls, db: Database, open_ended_since: datetime
+    ) -> list[PollModel]:
+        """Open polls, except ones without `closes_at` created before
+        `open_ended_since`.
+        """
+        cursor = db.polls.find(
+            {
+                "closed": False,
+                "$or": [
+                    {"closes_at": {"$ne": None}},
+                    {"_id": {"$gte": disnake.utils.time_snowflake(open_ended_since)}},
+                ],
+            }
+        )
+        return [cls.from_raw(i) async for i in cursor]  # type: ignore
+
+    @staticmethod
+    def create_collections(db: Database) -> None:
+        import pymongo
+
+        col = db.polls
+        col.create_index([("closed", pymongo.ASCENDING)])
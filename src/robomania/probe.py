@@ -0,0 +1,52 @@
+"""Container healthcheck probe.
+
+Runs every healthcheck interval, so it imports only the standard library.
+`robomania.utils` isn't used here, as its `__init__` pulls in disnake.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import sys
+
+HOST = "localhost"
+# Same as `HEALTHCHECK_PORT` and `HEALTHCHECK_GOOD_STATUS_CODE`
+# in `robomania.utils.constants`.
+PORT = 6302
+GOOD_STATUS_CODE = 200
+PATH = "/healthcheck"
+TIMEOUT = 5.0
+
+
+def probe(
+    host: str = HOST, port: int = PORT, path: str = PATH, timeout: float = TIMEOUT
+) -> int:
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("GET", path)
+        status = connection.getresponse().status
+    except (OSError, http.client.HTTPException) as e:
+        print(f"Healthcheck failed: {e!r}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+
+    if status != GOOD_STATUS_CODE:
+        print(f"Healthcheck failed: status {status}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="robomania.probe")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT)
+    args = parser.parse_args(argv)
+
+    return probe(args.host, args.port, timeout=args.timeout)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
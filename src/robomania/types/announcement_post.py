@@ -1,22 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
 
 import disnake
+from typing_extensions import Self
 
 from robomania import config
 from robomania.models.facebook_post import FacebookPostScraped
 from robomania.types.image import Image
-from robomania.types.message import EmbedTextProcessor, MessageBuilder
+from robomania.types.message import EmbedLayout, MessageBuilder
 
 logger = logging.getLogger("robomania.types")
 
 
 class AnnouncementPost:
+    messages: list[MessageBuilder] | None
+
     def __init__(self, post: FacebookPostScraped) -> None:
         self.post = post
         self.subpost = post.subpost
+        self.messages = None
 
     def format_text(
         self,
@@ -41,40 +46,41 @@ class AnnouncementPost:
     def new(cls, post: FacebookPostScraped) -> AnnouncementPost:
         return cls(post)
 
-    async def send_subpost(self, target: disnake.TextChannel) -> None:
+    async def prepare_subpost(self) -> MessageBuilder | None:
         if not self.subpost:
-            return
+            return None
 
-        text_processor = EmbedTextProcessor()
-        first_embed_text, *rest_texts = text_processor(
-            disnake.utils.escape_markdown(self.subpost.text)
+        layout = EmbedLayout(
+            author=self.subpost.author,
+            color=0xF4E152,
+            timestamp=datetime.fromtimestamp(self.subpost.timestamp),
         )
-        author = self.subpost.author
-        timestamp = datetime.fromtimestamp(self.subpost.timestamp)
+        embeds = layout(disnake.utils.escape_markdown(self.subpost.text))
         images = await Image.download_images(
             [self.format_image_url(i) for i in self.subpost.images]
         )
 
-        embeds: list[disnake.Embed] = []
-
-        embed = disnake.Embed.from_dict(
-            {
-                "author": {"name": author},
-                "color": 0xF4E152,
-                "description": first_embed_text,
-            }
+        # Images may have to be re-encoded, which shouldn't block the loop.
+        return await asyncio.to_thread(
+            MessageBuilder().message_with_embeds_and_images, embeds, images
         )
 
-        embeds.append(embed)
-
-        for i in rest_texts:
-            embeds.append(disnake.Embed.from_dict({"description": i}))
+    async def prepare_post(self) -> MessageBuilder:
+        text = self.format_text(self.post.text)
+        images = await Image.download_images(
+            [self.format_image_url(i) for i in self.post.images]
+        )
 
-        embeds[-1].timestamp = timestamp
+        return await asyncio.to_thread(
+            MessageBuilder().text_with_images_message, text, images
+        )
 
-        await MessageBuilder().message_with_embeds_and_images(embeds, images).send(
-            target
+    async def prepare(self) -> Self:
+        post, subpost = await asyncio.gather(
+            self.prepare_post(), self.prepare_subpost()
         )
+        self.messages = [post] if subpost is None else [post, subpost]
+        return self
 
     async def send(self, target: disnake.TextChannel, **kwargs) -> None:
         logger.info(
@@ -82,11 +88,8 @@ class AnnouncementPost:
             f"{len(self.post.images)} images."
         )
 
-        text = self.format_text(self.post.text)
-        images = await Image.download_images(
-            [self.format_image_url(i) for i in self.post.images]
-        )
-
-        await MessageBuilder().text_with_images_message(text, images).send(target)
+        if self.messages is None:
+            await self.prepare()
 
-        await self.send_subpost(target)
+        for message in self.messages or []:
+            await message.send(target)
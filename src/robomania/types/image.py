@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import io
 import logging
+from collections import deque
 from pathlib import Path
 from typing import Generator
 from urllib.parse import urlparse
@@ -11,11 +13,16 @@ import disnake
 from PIL import Image as PILImage
 
 from robomania.utils import rewindable_buffer
+from robomania.utils.metrics import metrics
 
 logger = logging.getLogger("robomania.types")
 MAX_IMAGES_PER_MESSAGE = 10
 MAX_TOTAL_SIZE_OF_IMAGES = 25 * 1024 * 1024
 
+image_bytes = metrics.counter(
+    "robomania_image_bytes_total", "Bytes of images processed by stage", ("stage",)
+)
+
 
 class Image:
     _data: io.BytesIO
@@ -34,6 +41,8 @@ class Image:
             img = PILImage.open(data)
             img.convert("RGB").save(image, "jpeg")
 
+        image_bytes.inc("converted", amount=self.size)
+
     def _reduce_image_resolution(self, factor: float) -> None:
         self.image = io.BytesIO()
 
@@ -44,6 +53,8 @@ class Image:
             resized_img = img.resize(new_size)
             resized_img.save(image, "jpeg")
 
+        image_bytes.inc("resized", amount=self.size)
+
     def reduce_size(self, max_size: int) -> None:
         self._change_image_format()
 
@@ -66,55 +77,123 @@ class Image:
     def file(self) -> disnake.File:
         return disnake.File(self.image, self.name)
 
+    @staticmethod
+    def _fit_images(images: list[Image]) -> list[Image]:
+        out = []
+
+        for image in images:
+            if image.size > MAX_TOTAL_SIZE_OF_IMAGES:
+                logger.info("Image too big, trying to reduce size.")
+                try:
+                    image.reduce_size(MAX_TOTAL_SIZE_OF_IMAGES)
+                except ValueError:
+                    logger.error("Image still too big, skipping.")
+                    continue
+
+            out.append(image)
+
+        return out
+
+    @staticmethod
+    def _pack_in_order(
+        sizes: list[int], max_image_count_per_message: int
+    ) -> list[list[int]]:
+        groups: list[list[int]] = []
+        current_group: list[int] = []
+        current_total_size = 0
+
+        for index, size in enumerate(sizes):
+            if (
+                len(current_group) + 1 > max_image_count_per_message
+                or size + current_total_size > MAX_TOTAL_SIZE_OF_IMAGES
+            ) and current_group:
+                groups.append(current_group)
+                current_group = []
+                current_total_size = 0
+
+            current_total_size += size
+            current_group.append(index)
+
+        if current_group:
+            groups.append(current_group)
+
+        return groups
+
+    @staticmethod
+    def _pack_first_fit_decreasing(
+        sizes: list[int], max_image_count_per_message: int
+    ) -> list[list[int]]:
+        groups: list[list[int]] = []
+        group_sizes: list[int] = []
+        queue = deque(sorted(range(len(sizes)), key=lambda i: sizes[i], reverse=True))
+
+        while queue:
+            index = queue.popleft()
+            size = sizes[index]
+
+            for group_index, group in enumerate(groups):
+                if (
+                    len(group) < max_image_count_per_message
+                    and group_sizes[group_index] + size <= MAX_TOTAL_SIZE_OF_IMAGES
+                ):
+                    group.append(index)
+                    group_sizes[group_index] += size
+                    break
+            else:
+                groups.append([index])
+                group_sizes.append(size)
+
+        for group in groups:
+            group.sort()
+        groups.sort(key=lambda group: group[0])
+
+        return groups
+
     @staticmethod
     def prepare_images(
         images: list[Image],
         max_image_count_per_message: int = MAX_IMAGES_PER_MESSAGE,
+        allow_reordering: bool = True,
     ) -> Generator[list[disnake.File], None, None]:
-        current_image_group: list[disnake.File] = []
-        current_total_size = 0
+        images = Image._fit_images(images)
+        sizes = [image.size for image in images]
 
-        try:
-            while True:
-                image = images.pop(0)
+        groups = Image._pack_in_order(sizes, max_image_count_per_message)
 
-                if image.size > MAX_TOTAL_SIZE_OF_IMAGES:
-                    logger.info("Image too big, trying to reduce size.")
-                    try:
-                        image.reduce_size(MAX_TOTAL_SIZE_OF_IMAGES)
-                    except ValueError:
-                        logger.error("Image still too big, skipping.")
-                        continue
+        # Original order is kept, unless reordering saves at least one message.
+        if allow_reordering and len(groups) > 1:
+            reordered_groups = Image._pack_first_fit_decreasing(
+                sizes, max_image_count_per_message
+            )
+            if len(reordered_groups) < len(groups):
+                groups = reordered_groups
 
-                if (
-                    len(current_image_group) + 1 > max_image_count_per_message
-                    or image.size + current_total_size > MAX_TOTAL_SIZE_OF_IMAGES
-                ):
-                    yield current_image_group
+        if not groups:
+            yield []
+            return
 
-                    current_image_group = []
-                    current_total_size = 0
+        for group in groups:
+            yield [disnake.File(images[i].image, images[i].name) for i in group]
 
-                current_total_size += image.size
-                current_image_group.append(disnake.File(image.image, image.name))
-        except IndexError:
-            pass
+    @staticmethod
+    async def _download_image(session: aiohttp.ClientSession, url: str) -> Image | None:
+        async with session.get(url) as resp:
+            if resp.status != 200:
+                logger.warning("Problem with image download.")
+                return None
 
-        yield current_image_group
+            data = io.BytesIO(await resp.read())
+            image_bytes.inc("downloaded", amount=data.getbuffer().nbytes)
+            image_path = Path(urlparse(url).path)
+            return Image(data, image_path.name)
 
     @staticmethod
     async def download_images(images: list[str]) -> list[Image]:
-        out = []
         async with aiohttp.ClientSession() as session:
-            for url in images:
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        logger.warning("Problem with image download.")
-                        continue
-
-                    data = io.BytesIO(await resp.read())
-                    image_path = Path(urlparse(url).path)
-                    out.append(Image(data, image_path.name))
+            downloaded = await asyncio.gather(
+                *(Image._download_image(session, url) for url in images)
+            )
 
+        out = [i for i in downloaded if i is not None]
         logger.debug(f"Downloaded {len(out)} images")
         return out
@@ -1,33 +1,79 @@
+from __future__ import annotations
+
+import asyncio
 import logging
-import re
-from functools import partial
-from textwrap import TextWrapper
+import time
+from datetime import datetime
 from typing import Protocol
 
 import disnake
-from disnake import Embed, File
+from disnake import AllowedMentions, Embed, File
 from disnake.interactions import ApplicationCommandInteraction
 from typing_extensions import Self
 
 from robomania.types.image import Image
+from robomania.utils.metrics import metrics
 from robomania.utils.pipe import Pipe
+from robomania.utils.rate_limit import TokenBucket
+from robomania.utils.text import TextNormalizer, TextSplitter
 
 MAX_CHARACTERS_PER_POST = 2000
 MAX_CHARACTERS_FOR_EMBED = 4096
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARACTERS_PER_MESSAGE = 6000
+
+# Discord allows 5 messages per 5 seconds in a channel and 50 requests
+# per second globally.
+CHANNEL_SEND_RATE = 5
+CHANNEL_SEND_PER = 5.0
+GLOBAL_SEND_RATE = 50
+GLOBAL_SEND_PER = 1.0
 
-space_regex = re.compile(" +")
-space_before_punctuation = re.compile(" (?=[.,?!–—-])")
-three_dots = re.compile("\\.{3}")
+HTTP_PAYLOAD_TOO_LARGE = 413
+DISCORD_INVALID_FORM_BODY = 50035
+DISCORD_REQUEST_ENTITY_TOO_LARGE = 40005
 
 
 logger = logging.getLogger("robomania.message")
 
+send_latency = metrics.histogram(
+    "robomania_message_send_seconds", "Latency of successfully sent messages"
+)
+rate_limited = metrics.counter(
+    "robomania_discord_rate_limited_total",
+    "Requests rate limited by Discord and retried by disnake",
+)
+
+
+class RateLimitCounter(logging.Filter):
+    """Count the 429s disnake waits out itself, it logs them but never raises."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str) and record.msg.startswith(
+            "We are being rate limited."
+        ):
+            rate_limited.inc()
+        return True
+
+
+logging.getLogger("disnake.http").addFilter(RateLimitCounter())
+
+MessageTarget = ApplicationCommandInteraction | disnake.abc.Messageable
+
+
+def is_too_big(error: disnake.HTTPException) -> bool:
+    return error.status == HTTP_PAYLOAD_TOO_LARGE or error.code in (
+        DISCORD_INVALID_FORM_BODY,
+        DISCORD_REQUEST_ENTITY_TOO_LARGE,
+    )
+
 
 class Message:
     text: str
     images: list[File]
     embeds: list[Embed]
     suppress_embeds: bool = False
+    allowed_mentions: AllowedMentions | None = None
 
     @property
     def has_files(self) -> bool:
@@ -54,45 +100,162 @@ class Message:
     def is_empty(self) -> bool:
         return not bool(self.text or self.images or self.embeds)
 
-    async def send(
-        self,
-        message_target: ApplicationCommandInteraction | disnake.abc.Messageable,
-    ) -> None:
+    async def send(self, message_target: MessageTarget) -> None:
+        """Send the message, with embeds in a separate message when it's too big.
+
+        disnake already retries rate limited requests and server errors, other
+        failures are raised. A failed request isn't repeated here, as it may
+        have been delivered anyway.
+        """
         if self.is_empty:
             return
 
         try:
-            await self.__send(message_target)
+            await self.__send_body(message_target, separate_embeds=False)
+            return
         except disnake.HTTPException as e:
-            logger.error("Failed to message, retrying", exc_info=e)
-        except ValueError as e:
-            logger.error("Message too big, retrying", exc_info=e)
-        else:
+            if not (is_too_big(e) and self.embeds):
+                raise
+        except ValueError:
+            if not self.embeds:
+                raise
+
+        logger.warning("Message too big, sending embeds separately")
+        await self.__send_body(message_target, separate_embeds=True)
+        await self.__send(message_target, embeds=self.embeds)
+
+    async def __send_body(
+        self, message_target: MessageTarget, separate_embeds: bool
+    ) -> None:
+        if separate_embeds and not (self.text or self.images):
             return
 
-        try:
-            await self.__send(message_target, True)
-        except Exception as e:
-            logger.error("Failed to send message", exc_info=e)
+        # Files are backed by the images' buffers, so they have to be
+        # rewound after the message turned out too big instead of being
+        # recreated.
+        for i in self.images:
+            i.reset(seek=True)
 
-    async def __send(
-        self,
-        message_target: ApplicationCommandInteraction | disnake.abc.Messageable,
-        separate_embeds: bool = False,
-    ) -> None:
-        if isinstance(message_target, ApplicationCommandInteraction):
-            send = message_target.response.send_message
-        else:
-            send = message_target.send  # type: ignore
-
-        await send(
+        await self.__send(
+            message_target,
             self.text or None,
             embeds=self.embeds if not separate_embeds else [],
             files=self.images,
             suppress_embeds=self.suppress_embeds,
         )
-        if separate_embeds:
-            await send(embeds=self.embeds)
+
+    async def __send(self, message_target: MessageTarget, *args, **kwargs) -> None:
+        # Interaction's send responds or follows up a deferred response.
+        start = time.perf_counter()
+        await message_target.send(
+            *args, allowed_mentions=self.allowed_mentions, **kwargs
+        )
+        send_latency.observe(time.perf_counter() - start)
+
+
+SendJob = tuple[list[Message], MessageTarget, asyncio.Future]
+
+
+class SendScheduler:
+    """Sends messages through per-channel queues, paced to Discord's limits."""
+
+    queues: dict[int, asyncio.Queue[SendJob]]
+    workers: dict[int, asyncio.Task]
+    buckets: dict[int, TokenBucket]
+
+    def __init__(self) -> None:
+        self.queues = {}
+        self.workers = {}
+        self.buckets = {}
+        self.global_bucket = TokenBucket(GLOBAL_SEND_RATE, GLOBAL_SEND_PER)
+
+    @staticmethod
+    def get_channel_id(message_target: MessageTarget) -> int:
+        if isinstance(message_target, ApplicationCommandInteraction):
+            return message_target.channel_id
+        return getattr(message_target, "id", id(message_target))
+
+    @staticmethod
+    def is_initial_response(message_target: MessageTarget) -> bool:
+        return (
+            isinstance(message_target, ApplicationCommandInteraction)
+            and not message_target.response.is_done()
+        )
+
+    def schedule(
+        self, messages: list[Message], message_target: MessageTarget
+    ) -> asyncio.Future[None]:
+        """Queue `messages` to be sent in order, as one job.
+
+        When one of them fails, the rest isn't sent and the future carries
+        the error.
+        """
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        messages = [i for i in messages if not i.is_empty]
+        if not messages:
+            future.set_result(None)
+            return future
+
+        if self.is_initial_response(message_target):
+            # Interactions have to be responded to within 3 seconds, so the
+            # response doesn't wait behind messages of the channel.
+            return asyncio.ensure_future(self.send_job(messages, message_target))
+
+        channel_id = self.get_channel_id(message_target)
+
+        try:
+            queue = self.queues[channel_id]
+        except KeyError:
+            queue = self.queues[channel_id] = asyncio.Queue()
+        queue.put_nowait((messages, message_target, future))
+
+        worker = self.workers.get(channel_id)
+        if worker is None or worker.done():
+            self.workers[channel_id] = asyncio.create_task(self._worker(channel_id))
+
+        return future
+
+    async def _worker(self, channel_id: int) -> None:
+        queue = self.queues[channel_id]
+        try:
+            bucket = self.buckets[channel_id]
+        except KeyError:
+            bucket = self.buckets[channel_id] = TokenBucket(
+                CHANNEL_SEND_RATE, CHANNEL_SEND_PER
+            )
+
+        while not queue.empty():
+            messages, message_target, future = queue.get_nowait()
+            if future.cancelled():
+                continue
+
+            try:
+                await self.send_job(
+                    messages, message_target, (bucket, self.global_bucket)
+                )
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(None)
+
+        del self.queues[channel_id]
+        del self.workers[channel_id]
+
+    @staticmethod
+    async def send_job(
+        messages: list[Message],
+        message_target: MessageTarget,
+        buckets: tuple[TokenBucket, ...] = (),
+    ) -> None:
+        for message in messages:
+            for bucket in buckets:
+                await bucket.acquire()
+            await message.send(message_target)
+
+
+send_scheduler = SendScheduler()
 
 
 class TextProcessorProtocol(Protocol):
@@ -101,17 +264,9 @@ class TextProcessorProtocol(Protocol):
 
 
 class TextProcessor(TextProcessorProtocol):
-    wrapper = TextWrapper(
-        MAX_CHARACTERS_PER_POST, expand_tabs=False, replace_whitespace=False
-    )
+    wrapper = TextSplitter(MAX_CHARACTERS_PER_POST)
 
-    text_processing_pipeline: Pipe[str] = (
-        Pipe()
-        | str.strip
-        | partial(space_regex.sub, " ")
-        | partial(space_before_punctuation.sub, "")
-        | partial(three_dots.sub, "…")
-    )
+    text_processing_pipeline: Pipe[str] = Pipe() | str.strip | TextNormalizer()
 
     @classmethod
     def _wrap_text(cls, text: str) -> list[str]:
@@ -125,43 +280,120 @@ class TextProcessor(TextProcessorProtocol):
 
 
 class EmbedTextProcessor(TextProcessor):
-    wrapper = TextWrapper(
-        MAX_CHARACTERS_FOR_EMBED, expand_tabs=False, replace_whitespace=False
+    wrapper = TextSplitter(MAX_CHARACTERS_FOR_EMBED)
+
+
+class MarkdownEscapingTextProcessor(TextProcessor):
+    text_processing_pipeline: Pipe[str] = (
+        Pipe() | str.strip | TextNormalizer(escape_markdown=True)
     )
 
 
+def pack_embeds(embeds: list[Embed]) -> list[list[Embed]]:
+    groups: list[list[Embed]] = []
+    current_group: list[Embed] = []
+    current_size = 0
+
+    for embed in embeds:
+        size = len(embed)
+        if current_group and (
+            len(current_group) >= MAX_EMBEDS_PER_MESSAGE
+            or current_size + size > MAX_EMBED_CHARACTERS_PER_MESSAGE
+        ):
+            groups.append(current_group)
+            current_group = []
+            current_size = 0
+
+        current_group.append(embed)
+        current_size += size
+
+    if current_group:
+        groups.append(current_group)
+
+    return groups
+
+
+class EmbedLayout:
+    """Lay out text as embeds, that fill messages up to Discord's limits."""
+
+    description_splitter = TextSplitter(MAX_CHARACTERS_FOR_EMBED)
+    text_processing_pipeline = TextProcessor.text_processing_pipeline
+
+    def __init__(
+        self,
+        author: str | None = None,
+        color: int | None = None,
+        timestamp: datetime | None = None,
+    ) -> None:
+        self.author = author
+        self.color = color
+        self.timestamp = timestamp
+
+    def __call__(self, text: str) -> list[Embed]:
+        text = self.text_processing_pipeline(text)
+
+        # Author name counts towards the limit of the message.
+        message_splitter = TextSplitter(
+            MAX_EMBED_CHARACTERS_PER_MESSAGE - len(self.author or "")
+        )
+        descriptions = [
+            description
+            for message_text in message_splitter.wrap(text) or [""]
+            for description in self.description_splitter.wrap(message_text) or [""]
+        ]
+
+        embeds = [Embed(description=i) for i in descriptions]
+
+        if self.author:
+            embeds[0].set_author(name=self.author)
+        if self.color is not None:
+            embeds[0].colour = self.color
+        if self.timestamp:
+            embeds[-1].timestamp = self.timestamp
+
+        return embeds
+
+
 class MessageBuilder:
     messages: list[Message]
 
-    def __init__(self, text_processor: TextProcessorProtocol | None = None) -> None:
+    def __init__(
+        self,
+        text_processor: TextProcessorProtocol | None = None,
+        allowed_mentions: AllowedMentions | None = None,
+    ) -> None:
         self.text_processor = text_processor or TextProcessor()
+        self.allowed_mentions = allowed_mentions
         self.messages = []
         self.new_message()
 
     def process_text(self, text: str) -> list[str]:
         return self.text_processor(text)
 
-    def text_with_images_message(self, text: str, images: list[Image]) -> Self:
+    def text_with_images_message(
+        self, text: str, images: list[Image], suppress_embeds: bool = True
+    ) -> Self:
         i: object
         *split_text, last_text = self.process_text(text)
 
         for i in split_text:
-            self.add_text(i).suppress_embed(True).new_message()
+            self.add_text(i).suppress_embed(suppress_embeds).new_message()
 
-        self.add_text(last_text).suppress_embed(True)
+        self.add_text(last_text).suppress_embed(suppress_embeds)
 
         if images:
             image_batcher = Image.prepare_images(images)
 
             for i in image_batcher:
-                self.add_images(i).suppress_embed(True).new_message()
+                self.add_images(i).suppress_embed(suppress_embeds).new_message()
 
         return self
 
     def message_with_embeds_and_images(
         self, embeds: list[Embed], images: list[Image]
     ) -> Self:
-        self.add_embeds(embeds).new_message()
+        for group in pack_embeds(embeds):
+            self.add_embeds(group).new_message()
 
         if images:
             image_batcher = Image.prepare_images(images)
@@ -173,6 +405,7 @@ class MessageBuilder:
 
     def new_message(self) -> Self:
         self.current_message = Message()
+        self.current_message.allowed_mentions = self.allowed_mentions
         self.messages.append(self.current_message)
         return self
 
@@ -201,11 +434,11 @@ class MessageBuilder:
         self.current_message.embeds.append(embed)
         return self
 
-    async def send(
-        self, message_target: ApplicationCommandInteraction | disnake.abc.Messageable
-    ) -> None:
-        for i in self.messages:
-            await i.send(message_target)
+    def schedule(self, message_target: MessageTarget) -> asyncio.Future[None]:
+        return send_scheduler.schedule(self.messages, message_target)
+
+    async def send(self, message_target: MessageTarget) -> None:
+        await self.schedule(message_target)
 
     def suppress_embed(self, value: bool) -> Self:
         self.current_message.suppress_embeds = value
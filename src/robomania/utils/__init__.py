@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import inspect
 import logging
-from typing import BinaryIO, Generator, Protocol, TextIO, Type, TypeVar
+from collections import deque
+from typing import (
+    AsyncGenerator,
+    Awaitable,
+    BinaryIO,
+    Generator,
+    Iterable,
+    Protocol,
+    TextIO,
+    Type,
+    TypeVar,
+)
 
 logger = logging.getLogger("robomania.utils")
 
@@ -16,6 +28,7 @@ class Preconfigurable(Protocol):
 
 _preconfigurable = TypeVar("_preconfigurable", bound=Preconfigurable)
 Buffer = TypeVar("Buffer", bound=TextIO | BinaryIO)
+T = TypeVar("T")
 
 
 @contextlib.contextmanager
@@ -35,3 +48,30 @@ def preconfigure(cls: Type[_preconfigurable]) -> Type[_preconfigurable]:
         logger.error(f"Preconfiguration method missing: {file}:{cls.__name__}")
 
     return cls
+
+
+async def prefetch(
+    awaitables: Iterable[Awaitable[T]], size: int
+) -> AsyncGenerator[T, None]:
+    # Awaitables are taken lazily, so at most `size` of them run ahead of
+    # the consumer, while results are still yielded in order.
+    source = iter(awaitables)
+    pending: deque[asyncio.Future[T]] = deque()
+
+    def schedule() -> None:
+        try:
+            pending.append(asyncio.ensure_future(next(source)))
+        except StopIteration:
+            pass
+
+    for _ in range(max(size, 1)):
+        schedule()
+
+    try:
+        while pending:
+            result = await pending.popleft()
+            schedule()
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
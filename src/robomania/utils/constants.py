@@ -1,2 +1,3 @@
 HEALTHCHECK_GOOD_STATUS_CODE = 200
 HEALTHCHECK_POOR_STATUS_CODE = 530
+HEALTHCHECK_PORT = 6302
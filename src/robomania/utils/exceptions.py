@@ -8,3 +8,7 @@ class DuplicateError(Exception):
 
 class DivByZeroWarning(Warning):
     pass
+
+
+class TemplateError(ValueError):
+    """Raised when a template uses placeholders, that aren't allowed."""
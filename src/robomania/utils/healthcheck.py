@@ -1,5 +1,8 @@
+from __future__ import annotations
+
 import json
 import logging
+from typing import TYPE_CHECKING
 
 from aiohttp import web
 from aiohttp.web_request import Request
@@ -9,22 +12,47 @@ from typing_extensions import Self
 from robomania.utils.constants import (
     HEALTHCHECK_GOOD_STATUS_CODE,
     HEALTHCHECK_POOR_STATUS_CODE,
+    HEALTHCHECK_PORT,
 )
+from robomania.utils.metrics import format_value, gauge, metrics
+
+if TYPE_CHECKING:
+    from robomania.utils.loop_monitor import LoopLagMonitor
 
 logger = logging.getLogger("robomania.healthcheck")
 
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
 
 class HealthcheckClient:
     runner: web.AppRunner
 
-    def __init__(self, bot: Bot, app: web.Application, max_latency: float = 20) -> None:
+    def __init__(
+        self,
+        bot: Bot,
+        app: web.Application,
+        max_latency: float = 20,
+        max_loop_lag: float = 1,
+    ) -> None:
         self.bot = bot
         self.max_latency = max_latency
+        self.max_loop_lag = max_loop_lag
         self.app = app
 
+    @property
+    def loop_monitor(self) -> LoopLagMonitor | None:
+        return getattr(self.bot, "loop_monitor", None)
+
     async def healthcheck(self, request: Request) -> web.Response:
+        loop_lag = (
+            max(self.loop_monitor.p99, self.loop_monitor.max_lag())
+            if self.loop_monitor
+            else 0
+        )
+
         if (
             self.bot.latency > self.max_latency
+            or loop_lag > self.max_loop_lag
             or self.bot.user is None
             or not self.bot.is_ready()
             or self.bot.is_closed()
@@ -40,25 +68,61 @@ class HealthcheckClient:
             body=body, status=status, content_type="application/json", charset="utf-8"
         )
 
+    async def metrics(self, request: Request) -> web.Response:
+        lines = [
+            *gauge(
+                "robomania_gateway_latency_seconds",
+                "Discord gateway heartbeat latency",
+                self.bot.latency,
+            ),
+        ]
+        if self.loop_monitor is not None:
+            lines.extend(
+                [
+                    "# HELP robomania_event_loop_lag_seconds Event loop lag quantiles",
+                    "# TYPE robomania_event_loop_lag_seconds gauge",
+                    *(
+                        f'robomania_event_loop_lag_seconds{{quantile="{q}"}} '
+                        f"{format_value(self.loop_monitor.quantile(q))}"
+                        for q in (0.5, 0.99)
+                    ),
+                ]
+            )
+        body = metrics.render() + "\n".join(lines) + "\n"
+
+        return web.Response(
+            body=body.encode("utf-8"),
+            headers={"Content-Type": METRICS_CONTENT_TYPE},
+        )
+
+    async def mongo_stats(self, request: Request) -> web.Response:
+        monitor = getattr(self.bot, "mongo_monitor", None)
+        stats = monitor.snapshot() if monitor is not None else {}
+
+        return web.json_response(stats)
+
     async def shutdown(self) -> None:
         logger.info("Shutting down healthcheck server")
         await self.runner.shutdown()
         await self.runner.cleanup()
 
     @classmethod
-    async def start(cls, bot: Bot, max_latency: float = 20) -> Self:
+    async def start(
+        cls, bot: Bot, max_latency: float = 20, max_loop_lag: float = 1
+    ) -> Self:
         app = web.Application(loop=bot.loop)
-        client = cls(bot, app, max_latency)
+        client = cls(bot, app, max_latency, max_loop_lag)
         app.add_routes(
             [
                 web.get("/healthcheck", client.healthcheck),
+                web.get("/mongo", client.mongo_stats),
+                web.get("/metrics", client.metrics),
             ]
         )
-        # web.run_app(app, host='localhost', port=6302)
         runner = web.AppRunner(app)
         await runner.setup()
         client.runner = runner
-        site = web.TCPSite(runner, "0.0.0.0", 6302)
+        site = web.TCPSite(runner, "0.0.0.0", HEALTHCHECK_PORT)
         await site.start()
 
         logger.info("Started healthcheck server")
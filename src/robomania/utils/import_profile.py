@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Iterable, NamedTuple
+
+IMPORT_TIME_PREFIX = "import time:"
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_times(output: str) -> list[ImportTime]:
+    """Parse the `-X importtime` report printed to stderr."""
+    out = []
+    for line in output.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+
+        self_us, cumulative_us, name = line[len(IMPORT_TIME_PREFIX) :].split("|")
+        if not self_us.strip().isdigit():
+            # Header of the report.
+            continue
+
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        out.append(ImportTime(module, int(self_us), int(cumulative_us), depth))
+
+    return out
+
+
+def profile_imports(modules: Iterable[str]) -> list[ImportTime]:
+    """Import `modules` in a fresh interpreter, so already imported modules
+    don't hide their cost.
+    """
+    code = "\n".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_import_times(result.stderr)
+
+
+def format_report(times: list[ImportTime], limit: int = 20) -> str:
+    total = sum(i.self_us for i in times)
+    slowest = sorted(times, key=lambda i: i.cumulative_us, reverse=True)[:limit]
+
+    width = max((len(i.module) for i in slowest), default=0)
+    lines = [f"{'module':<{width}}  cumulative ms  self ms"]
+    lines.extend(
+        f"{i.module:<{width}}  {i.cumulative_us / 1000:>13.1f}  "
+        f"{i.self_us / 1000:>7.1f}"
+        for i in slowest
+    )
+    lines.append(f"{len(times)} modules imported in {total / 1000:.1f} ms")
+
+    return "\n".join(lines)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import copy
+import itertools
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+TEXT_FORMAT = "%(asctime)s:%(levelname)s:%(name)s: %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exception"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Let through every n-th record of chatty loggers.
+
+    `rates` maps logger names to the fraction of records that are kept,
+    children inherit the rate of the closest configured parent. Errors are
+    never dropped.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        super().__init__()
+        self.rates = dict(rates)
+        self.counters: dict[str, tuple[int, Iterator[int]]] = {}
+
+    def get_counter(self, name: str) -> tuple[int, Iterator[int]]:
+        try:
+            return self.counters[name]
+        except KeyError:
+            pass
+
+        rate = 1.0
+        parts = name.split(".")
+        for i in range(len(parts), 0, -1):
+            if (configured := self.rates.get(".".join(parts[:i]))) is not None:
+                rate = configured
+                break
+
+        every = max(round(1 / rate), 1) if rate > 0 else 0
+        return self.counters.setdefault(name, (every, itertools.count()))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+
+        every, counter = self.get_counter(record.name)
+        if every == 0:
+            return False
+        # `next` on `itertools.count` is atomic, so threads can log concurrently.
+        return next(counter) % every == 0
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for a listener in the same process.
+
+    Only the message is rendered in the calling thread, as arguments may change
+    later. Exceptions are kept for the formatter of the writer thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        return record
+
+
+def file_handler(
+    path: Path,
+    max_bytes: int = 0,
+    backup_count: int = 0,
+    when: str | None = None,
+) -> logging.Handler:
+    if when is not None:
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=when, backupCount=backup_count, encoding="utf-8"
+        )
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+
+
+class QueueLogging:
+    """Loggers hand records to a queue and a background thread writes them,
+    so logging never waits for disk or terminal I/O.
+    """
+
+    listeners: list[logging.handlers.QueueListener]
+
+    def __init__(
+        self,
+        json_lines: bool = False,
+        sampling: Mapping[str, float] | None = None,
+    ) -> None:
+        self.formatter = (
+            JsonFormatter() if json_lines else logging.Formatter(TEXT_FORMAT)
+        )
+        self.sampling = SamplingFilter(sampling or {})
+        self.listeners = []
+
+    def attach(
+        self, logger: logging.Logger, level: int, *handlers: logging.Handler
+    ) -> None:
+        records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+
+        queue_handler = RecordQueueHandler(records)
+        queue_handler.addFilter(self.sampling)
+
+        for handler in handlers:
+            handler.setFormatter(self.formatter)
+
+        listener = logging.handlers.QueueListener(
+            records, *handlers, respect_handler_level=True
+        )
+        listener.start()
+        self.listeners.append(listener)
+
+        logger.setLevel(level)
+        logger.addHandler(queue_handler)
+
+    def stop(self) -> None:
+        """Flush queued records and stop the writer threads."""
+        for listener in self.listeners:
+            listener.stop()
+        self.listeners.clear()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+logger = logging.getLogger("robomania.loop_monitor")
+
+LAG_SAMPLE_INTERVAL = 0.05
+# One minute of samples.
+LAG_WINDOW = 1200
+LAG_THRESHOLD = 0.25
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop runs a callback scheduled every
+    `interval` seconds.
+
+    A watchdog thread notices when the loop stops ticking for longer than
+    `threshold` and logs the stack of the code that is blocking it.
+    """
+
+    samples: deque[float]
+    # (monotonic time, lag) of ticks later than `threshold`, as one long stall
+    # is a single sample and barely moves the quantiles.
+    stalls: deque[tuple[float, float]]
+    handle: asyncio.TimerHandle | None
+
+    def __init__(
+        self,
+        interval: float = LAG_SAMPLE_INTERVAL,
+        window: int = LAG_WINDOW,
+        threshold: float = LAG_THRESHOLD,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.samples = deque(maxlen=window)
+        self.stalls = deque(maxlen=window)
+        self.handle = None
+        self.stopped = threading.Event()
+        self.last_tick = time.monotonic()
+        self.reported = False
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        self.loop = loop or asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.stopped.clear()
+
+        self.expected = self.loop.time() + self.interval
+        self.last_tick = time.monotonic()
+        self.handle = self.loop.call_later(self.interval, self._tick)
+
+        self.watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self.watchdog.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+
+    def _tick(self) -> None:
+        now = self.loop.time()
+        lag = max(now - self.expected, 0)
+        self.samples.append(lag)
+
+        if lag > self.threshold:
+            self.stalls.append((time.monotonic(), lag))
+            if not self.reported:
+                logger.warning(f"Event loop was blocked for {lag * 1000:.0f} ms")
+
+        self.last_tick = time.monotonic()
+        self.reported = False
+        self.expected = now + self.interval
+        self.handle = self.loop.call_later(self.interval, self._tick)
+
+    @property
+    def current_lag(self) -> float:
+        """How late the next tick already is, while the loop is blocked."""
+        if self.handle is None:
+            return 0
+        return max(time.monotonic() - self.last_tick - self.interval, 0)
+
+    def max_lag(self) -> float:
+        """Longest lag over the time covered by the samples, including a stall,
+        that is still going on.
+        """
+        assert self.samples.maxlen is not None
+        since = time.monotonic() - self.interval * self.samples.maxlen
+        return max([self.current_lag, *(lag for at, lag in self.stalls if at >= since)])
+
+    def _watch(self) -> None:
+        while not self.stopped.wait(self.threshold / 2):
+            blocked_for = self.current_lag
+            if blocked_for > self.threshold and not self.reported:
+                self.reported = True
+                self.report_blocking(blocked_for)
+
+    def report_blocking(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else "unknown"
+        task = asyncio.current_task(self.loop)
+        name = task.get_name() if task is not None else "callback"
+
+        logger.warning(
+            f"Event loop is blocked for {blocked_for * 1000:.0f} ms "
+            f"by {name}:\n{stack}"
+        )
+
+    def quantile(self, q: float) -> float:
+        if not self.samples:
+            return 0
+        samples = sorted(self.samples)
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+    @property
+    def p50(self) -> float:
+        return self.quantile(0.5)
+
+    @property
+    def p99(self) -> float:
+        return self.quantile(0.99)
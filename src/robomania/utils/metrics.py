@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Generic, Iterable, TypeVar
+
+logger = logging.getLogger("robomania.metrics")
+
+# Upper bounds in seconds.
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Label values, that can come from outside, are capped per metric.
+MAX_SERIES_PER_METRIC = 100
+OTHER_LABEL = "other"
+
+Labels = tuple[str, ...]
+Collector = Callable[[], Iterable[str]]
+TSeries = TypeVar("TSeries")
+
+
+class Histogram:
+    """Histogram with fixed buckets, safe to update from driver threads."""
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        # Last element counts values above the last bucket.
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket containing `q` quantile."""
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip((*self.buckets, math.inf), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return math.inf
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+def format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [
+        f'{name}="{escape_label(value)}"'
+        for name, value in zip(names, values)
+        if value is not None
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metric(Generic[TSeries]):
+    type: str
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.series: dict[Labels, TSeries] = {}
+        self.lock = threading.Lock()
+
+    def new_series(self) -> TSeries:
+        raise NotImplementedError
+
+    def get_series(self, labels: Labels) -> TSeries:
+        try:
+            return self.series[labels]
+        except KeyError:
+            pass
+
+        with self.lock:
+            is_new = labels not in self.series
+            if is_new and len(self.series) >= MAX_SERIES_PER_METRIC:
+                logger.warning(f'Too many series of "{self.name}" metric')
+                labels = (OTHER_LABEL,) * len(self.label_names)
+            return self.series.setdefault(labels, self.new_series())
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric[list[float]]):
+    type = "counter"
+
+    def new_series(self) -> list[float]:
+        return [0]
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        series = self.get_series(labels)
+        with self.lock:
+            series[0] += amount
+
+    def value(self, *labels: str) -> float:
+        return self.series.get(labels, [0])[0]
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, (value,) in list(self.series.items()):
+            lines.append(
+                f"{self.name}{format_labels(self.label_names, labels)} "
+                f"{format_value(value)}"
+            )
+        return lines
+
+
+class LabeledHistogram(Metric[Histogram]):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def new_series(self) -> Histogram:
+        return Histogram(self.buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        self.get_series(labels).observe(value)
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, histogram in list(self.series.items()):
+            lines.extend(
+                render_histogram(self.name, self.label_names, labels, histogram)
+            )
+        return lines
+
+
+def render_histogram(
+    name: str, label_names: Labels, labels: Labels, histogram: Histogram
+) -> list[str]:
+    with histogram.lock:
+        counts = list(histogram.counts)
+        total, count = histogram.sum, histogram.count
+
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip((*histogram.buckets, math.inf), counts):
+        cumulative += bucket_count
+        bucket_labels = format_labels(
+            (*label_names, "le"), (*labels, format_value(bound))
+        )
+        lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+
+    formatted_labels = format_labels(label_names, labels)
+    lines.append(f"{name}_sum{formatted_labels} {format_value(total)}")
+    lines.append(f"{name}_count{formatted_labels} {count}")
+    return lines
+
+
+class MetricsRegistry:
+    """Metrics rendered in the Prometheus text exposition format."""
+
+    metrics: dict[str, Metric]
+    collectors: list[Collector]
+
+    def __init__(self) -> None:
+        self.metrics = {}
+        self.collectors = []
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        return self.metrics.setdefault(name, Counter(name, help, labels))  # type: ignore
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> LabeledHistogram:
+        return self.metrics.setdefault(  # type: ignore
+            name, LabeledHistogram(name, help, labels, buckets)
+        )
+
+    def add_collector(self, collector: Collector) -> None:
+        """Add a function returning lines of metrics, that are read on scrape."""
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+
+        for collector in self.collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                logger.warning("Metrics collector failed", exc_info=e)
+
+        return "\n".join(lines) + "\n"
+
+
+def gauge(name: str, help: str, value: float, **labels: str) -> list[str]:
+    return [
+        f"# HELP {name} {help}",
+        f"# TYPE {name} gauge",
+        f"{name}{format_labels(labels, labels.values())} {format_value(value)}",
+    ]
+
+
+metrics = MetricsRegistry()
+cache_requests = metrics.counter(
+    "robomania_cache_requests_total", "Cache lookups by result", ("cache", "result")
+)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any
+
+from pymongo import monitoring
+
+from robomania.utils.metrics import Histogram, format_labels, render_histogram
+
+logger = logging.getLogger("robomania.mongo")
+
+# Collections are labels of histograms, so their number is kept bounded.
+MAX_TRACKED_COLLECTIONS = 50
+OTHER_COLLECTIONS = "other"
+
+
+class CommandLatencyListener(monitoring.CommandListener):
+    """Latency of commands per "database.collection"."""
+
+    latency: dict[str, Histogram]
+    failures: dict[str, int]
+    pending: dict[tuple[int, Any], str]
+
+    def __init__(self) -> None:
+        self.latency = {}
+        self.failures = {}
+        self.pending = {}
+
+    def get_label(self, event: monitoring.CommandStartedEvent) -> str:
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = "$cmd"
+
+        label = f"{event.database_name}.{collection}"
+        if label in self.latency:
+            return label
+        if len(self.latency) >= MAX_TRACKED_COLLECTIONS:
+            return OTHER_COLLECTIONS
+
+        # setdefault keeps the first histogram, when threads race.
+        self.latency.setdefault(label, Histogram())
+        return label
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.pending[event.request_id, event.connection_id] = self.get_label(event)
+
+    def _finished(self, event: Any) -> str:
+        label = self.pending.pop((event.request_id, event.connection_id), None)
+        if label is None:
+            label = OTHER_COLLECTIONS
+
+        try:
+            histogram = self.latency[label]
+        except KeyError:
+            histogram = self.latency.setdefault(label, Histogram())
+
+        histogram.observe(event.duration_micros / 1_000_000)
+        return label
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finished(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        label = self._finished(event)
+        self.failures[label] = self.failures.get(label, 0) + 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            label: {**histogram.snapshot(), "failures": self.failures.get(label, 0)}
+            for label, histogram in list(self.latency.items())
+        }
+
+
+class PoolWaitListener(monitoring.ConnectionPoolListener):
+    """Time spent waiting for a connection from the pool."""
+
+    def __init__(self) -> None:
+        self.wait = Histogram()
+        self.failures = 0
+        self.connections = 0
+        # Check out happens on the thread running the operation.
+        self.local = threading.local()
+
+    def connection_check_out_started(
+        self, event: monitoring.ConnectionCheckOutStartedEvent
+    ) -> None:
+        self.local.started_at = time.perf_counter()
+
+    def _checked_out(self) -> None:
+        started_at = getattr(self.local, "started_at", None)
+        if started_at is not None:
+            self.wait.observe(time.perf_counter() - started_at)
+            self.local.started_at = None
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        self._checked_out()
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        self._checked_out()
+        self.failures += 1
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        self.connections += 1
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        self.connections -= 1
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        logger.warning(f"Connection pool for {event.address} was cleared")
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        pass
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **self.wait.snapshot(),
+            "failures": self.failures,
+            "connections": self.connections,
+        }
+
+
+class MongoMonitor:
+    def __init__(self) -> None:
+        self.commands = CommandLatencyListener()
+        self.pool = PoolWaitListener()
+
+    @property
+    def listeners(self) -> list[monitoring._EventListener]:
+        return [self.commands, self.pool]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"commands": self.commands.snapshot(), "pool": self.pool.snapshot()}
+
+    def render_metrics(self) -> list[str]:
+        name = "robomania_mongo_command_seconds"
+        lines = [
+            f"# HELP {name} Mongo command latency per collection",
+            f"# TYPE {name} histogram",
+        ]
+        for label, histogram in list(self.commands.latency.items()):
+            lines.extend(render_histogram(name, ("collection",), (label,), histogram))
+
+        name = "robomania_mongo_command_failures_total"
+        lines.extend(
+            [
+                f"# HELP {name} Failed Mongo commands per collection",
+                f"# TYPE {name} counter",
+            ]
+        )
+        for label, count in list(self.commands.failures.items()):
+            labels = format_labels(("collection",), (label,))
+            lines.append(f"{name}{labels} {count}")
+
+        name = "robomania_mongo_pool_wait_seconds"
+        lines.extend(
+            [
+                f"# HELP {name} Time spent waiting for a pooled connection",
+                f"# TYPE {name} histogram",
+                *render_histogram(name, (), (), self.pool.wait),
+            ]
+        )
+        return lines
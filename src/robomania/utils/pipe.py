@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from functools import reduce
+import time
 from typing import Any, Callable, Generic, TypeVar
 
 PipeStage = Callable[[Any], Any]
@@ -8,11 +8,14 @@ T = TypeVar("T")
 
 
 class Pipe(Generic[T]):
-    pipeline: list[PipeStage]
+    pipeline: tuple[PipeStage, ...]
+    timings: list[float]
+    calls: int
 
     def __init__(self, *args: PipeStage) -> None:
-        self.pipeline = []
-        self.pipeline.extend(args)
+        self.pipeline = args
+        self._compiled: Callable[[Any], T] | None = None
+        self.reset_timings()
 
     def copy(self) -> Pipe:
         return Pipe(*self.pipeline)
@@ -21,13 +24,48 @@ class Pipe(Generic[T]):
         return self.__or__(func)
 
     def __or__(self, func: PipeStage) -> Pipe:
-        self.pipeline.append(func)
-        return self
+        return Pipe(*self.pipeline, func)
 
     def __ror__(self, func: PipeStage) -> Pipe:
-        out: Pipe[Any] = Pipe(func)
-        out.pipeline.extend(self.pipeline)
-        return out
+        return Pipe(func, *self.pipeline)
+
+    def compile(self, timed: bool = False) -> Callable[[Any], T]:
+        namespace: dict[str, Any] = {
+            f"_stage{i}": stage for i, stage in enumerate(self.pipeline)
+        }
+        lines = ["def pipe(x):"]
+
+        if timed:
+            namespace.update(_clock=time.perf_counter, _self=self)
+            lines.append("    _timings = _self.timings")
+            lines.append("    _self.calls += 1")
+            for i in range(len(self.pipeline)):
+                lines.append("    _start = _clock()")
+                lines.append(f"    x = _stage{i}(x)")
+                lines.append(f"    _timings[{i}] += _clock() - _start")
+        else:
+            lines.extend(f"    x = _stage{i}(x)" for i in range(len(self.pipeline)))
+
+        lines.append("    return x")
+        exec("\n".join(lines), namespace)
+
+        return namespace["pipe"]
+
+    def enable_timings(self, enabled: bool = True) -> None:
+        self.reset_timings()
+        self._compiled = self.compile(timed=enabled)
+
+    def reset_timings(self) -> None:
+        self.timings = [0.0] * len(self.pipeline)
+        self.calls = 0
+
+    def timings_report(self) -> dict[str, float]:
+        return {
+            f'{i}: {getattr(stage, "__qualname__", repr(stage))}': timing
+            for i, (stage, timing) in enumerate(zip(self.pipeline, self.timings))
+        }
 
     def __call__(self, x: Any) -> T:
-        return reduce(lambda v, func: func(v), self.pipeline, x)
+        if self._compiled is None:
+            self._compiled = self.compile()
+        return self._compiled(x)
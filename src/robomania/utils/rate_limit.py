@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import disnake
+
+
+class TokenBucket:
+    def __init__(self, rate: int, per: float) -> None:
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.rate, self.tokens + (now - self.updated_at) * self.rate / self.per
+        )
+        self.updated_at = now
+
+    def delay(self) -> float:
+        self._refill()
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) * self.per / self.rate
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while (delay := self.delay()) > 0:
+                await asyncio.sleep(delay)
+            self.tokens -= 1
+
+    def block_for(self, seconds: float) -> None:
+        """Drain the bucket, so next token will be available after `seconds`."""
+        self._refill()
+        self.tokens = min(self.tokens, 1 - seconds * self.rate / self.per)
+
+
+def backoff_delay(
+    attempt: int, base: float = 0.5, cap: float = 30, retry_after: float | None = None
+) -> float:
+    delay = min(cap, base * 2**attempt) * random.uniform(0.5, 1)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def get_retry_after(error: disnake.HTTPException) -> float | None:
+    try:
+        return float(error.response.headers["Retry-After"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Iterable, cast
+
+import disnake
+
+from robomania.utils.rate_limit import TokenBucket, backoff_delay, get_retry_after
+
+logger = logging.getLogger("robomania.reactions")
+
+# Discord allows adding one reaction per 0.25 seconds in a channel.
+REACTION_RATE = 1
+REACTION_PER = 0.25
+MAX_REACTION_ATTEMPTS = 3
+HTTP_TOO_MANY_REQUESTS = 429
+
+
+class ReactionApplier:
+    """Adds reactions paced to the per-channel reaction limit.
+
+    Requests are issued as soon as the bucket allows, instead of being sent
+    immediately and waiting out a 429. Reactions are shown in the order
+    Discord receives them, so for a single message they are added one after
+    another, but the token for the next reaction is awaited while the previous
+    request is in flight.
+    """
+
+    buckets: dict[int, TokenBucket]
+
+    def __init__(self) -> None:
+        self.buckets = {}
+
+    def get_bucket(self, channel_id: int) -> TokenBucket:
+        try:
+            return self.buckets[channel_id]
+        except KeyError:
+            bucket = self.buckets[channel_id] = TokenBucket(REACTION_RATE, REACTION_PER)
+            return bucket
+
+    async def add_reaction(
+        self, message: disnake.Message, emoji: str, bucket: TokenBucket
+    ) -> None:
+        """Add a reaction, for which a token was already taken."""
+        for attempt in range(MAX_REACTION_ATTEMPTS):
+            if attempt > 0:
+                await bucket.acquire()
+            try:
+                await message.add_reaction(emoji)
+                return
+            except disnake.HTTPException as e:
+                if (
+                    e.status != HTTP_TOO_MANY_REQUESTS
+                    or attempt == MAX_REACTION_ATTEMPTS - 1
+                ):
+                    raise
+
+                delay = backoff_delay(
+                    attempt, REACTION_PER, retry_after=get_retry_after(e)
+                )
+                logger.warning(f"Reaction was rate limited, retrying in {delay:.2f}s")
+                bucket.block_for(delay)
+
+    async def add_reactions(
+        self, message: disnake.Message, emojis: Iterable[str]
+    ) -> float:
+        """Add reactions in order and return how long it took."""
+        start = time.perf_counter()
+        bucket = self.get_bucket(message.channel.id)
+        emojis = list(emojis)
+
+        token: asyncio.Future[None] | None = asyncio.ensure_future(bucket.acquire())
+        try:
+            for i, emoji in enumerate(emojis):
+                await cast(asyncio.Future[None], token)
+                token = None
+                if i + 1 < len(emojis):
+                    token = asyncio.ensure_future(bucket.acquire())
+
+                await self.add_reaction(message, emoji, bucket)
+        finally:
+            if token is not None:
+                token.cancel()
+
+        return time.perf_counter() - start
+
+
+reaction_applier = ReactionApplier()
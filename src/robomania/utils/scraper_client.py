@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Iterable
+
+import httpx
+
+from robomania.utils.metrics import cache_requests
+
+if TYPE_CHECKING:
+    from robomania.config import Settings
+
+logger = logging.getLogger("robomania.scraper")
+
+LATENCY_SAMPLES_PER_ENDPOINT = 100
+HTTP_NOT_MODIFIED = 304
+
+RawPost = dict[str, Any]
+
+
+class ScraperClient:
+    latency: dict[str, deque[float]]
+    etag: str | None
+    unacknowledged: set[str]
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+        self.latency = {}
+        self.etag = None
+        self.unacknowledged = set()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> ScraperClient:
+        timeout = httpx.Timeout(
+            settings.scraper_timeout, connect=settings.scraper_connect_timeout
+        )
+        limits = httpx.Limits(
+            max_connections=settings.scraper_max_connections,
+            max_keepalive_connections=settings.scraper_max_keepalive_connections,
+            keepalive_expiry=settings.scraper_keepalive_expiry,
+        )
+
+        client = httpx.AsyncClient(
+            base_url=settings.scraping_service_url,
+            timeout=timeout,
+            limits=limits,
+            http2=find_spec("h2") is not None,
+        )
+        return cls(client)
+
+    def record_latency(self, endpoint: str, elapsed: float) -> None:
+        try:
+            samples = self.latency[endpoint]
+        except KeyError:
+            samples = self.latency[endpoint] = deque(
+                maxlen=LATENCY_SAMPLES_PER_ENDPOINT
+            )
+
+        samples.append(elapsed)
+        logger.debug(f'Request to "{endpoint}" took {elapsed * 1000:.1f} ms')
+
+    def mean_latency(self, endpoint: str) -> float | None:
+        samples = self.latency.get(endpoint)
+        if not samples:
+            return None
+        return sum(samples) / len(samples)
+
+    async def request(
+        self, method: str, endpoint: str, **kwargs: Any
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            return await self.client.request(method, endpoint, **kwargs)
+        finally:
+            self.record_latency(endpoint, time.perf_counter() - start)
+
+    async def get(self, endpoint: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", endpoint, **kwargs)
+
+    async def post(self, endpoint: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", endpoint, **kwargs)
+
+    async def get_unposted(self) -> list[RawPost]:
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        response = await self.get("posts/unposted", headers=headers)
+
+        if response.status_code == HTTP_NOT_MODIFIED:
+            logger.debug("Unposted posts did not change since last check")
+            cache_requests.inc("scraper_etag", "hit")
+            return []
+
+        cache_requests.inc("scraper_etag", "miss")
+
+        try:
+            raw_posts: list[RawPost] = response.json().get("data", [])
+        except Exception:
+            return []
+
+        # Posts that were sent, but couldn't be marked as posted, are skipped
+        # before any parsing happens.
+        new_posts = [
+            i for i in raw_posts if i.get("post_id") not in self.unacknowledged
+        ]
+        logger.info(f"Got {len(raw_posts)} posts, {len(new_posts)} new")
+
+        # ETag is remembered only for responses, that don't require any work.
+        # Otherwise a failure while sending posts would hide them until
+        # the scraper's state changes.
+        if not new_posts:
+            self.etag = response.headers.get("ETag")
+
+        return new_posts
+
+    def acknowledge(self, ids: Iterable[str]) -> None:
+        """Remember posts as sent, until they are marked as posted."""
+        self.unacknowledged.update(ids)
+
+    async def mark_as_posted(self, ids: Iterable[str] = ()) -> bool:
+        self.acknowledge(ids)
+
+        if not self.unacknowledged:
+            return True
+
+        to_acknowledge = list(self.unacknowledged)
+        try:
+            response = await self.post("posts/posted", json={"ids": to_acknowledge})
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(
+                f"Couldn't mark {len(to_acknowledge)} posts as posted", exc_info=e
+            )
+            return False
+
+        self.unacknowledged.difference_update(to_acknowledge)
+        return True
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    @property
+    def is_closed(self) -> bool:
+        return self.client.is_closed
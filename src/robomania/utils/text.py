@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Callable
+
+PUNCTUATION = ".,?!–—-"
+
+# Same patterns as used by `disnake.utils.escape_markdown`.
+URL = r"<[^: >]+:\/[^ >]+>|(?:https?|steam):\/\/[^\s<]+[^<.,:;\"\'\]\s]"
+URL_PATTERN = rf"(?P<url>{URL})"
+QUOTE_PATTERN = (
+    rf"(?P<quote>^>(?:>>)?)"
+    rf"(?:(?P<quote_spaces> +)(?![ {PUNCTUATION}])|(?P<quote_whitespace>[^\S ]))"
+)
+MARKDOWN_PATTERN = r"(?P<markdown>[_\\~|\*`])|(?P<link>\[.+\]\(.+\))"
+MARKDOWN_FIRST_CHARACTERS = "<hs>_\\~|*`["
+SPACES_PATTERN = rf"(?P<before_punctuation> +(?=[{PUNCTUATION}]))|(?P<spaces>  +)"
+# Spaces before dots are removed, so dots separated by spaces form one run.
+DOTS_PATTERN = r"(?P<dots>\.(?: *\.)+)"
+
+ENTITY_PATTERN = "|".join(
+    [
+        r"\\\S",
+        URL,
+        r"<t:-?\d+(?::[tTdDfFR])?>",
+        r"<(?:@[!&]?|#)\d+>",
+        r"<a?:\w+:\d+>",
+    ]
+)
+WORD = re.compile(r"\S+")
+ATOM = re.compile(rf"{ENTITY_PATTERN}|\S")
+
+MIN_CHUNK_FILL = 0.5
+SENTENCE_END = re.compile(r"[.!?…](?=\s)")
+
+Segment = tuple[int, int]
+
+
+class TextNormalizer:
+    """Normalize spaces and dots and optionally escape markdown in one pass."""
+
+    def __init__(self, escape_markdown: bool = False) -> None:
+        patterns = [SPACES_PATTERN, DOTS_PATTERN]
+        first_characters = " ."
+        if escape_markdown:
+            patterns = [URL_PATTERN, QUOTE_PATTERN, *patterns, MARKDOWN_PATTERN]
+            first_characters += MARKDOWN_FIRST_CHARACTERS
+
+        # Lookahead lets the regex skip most characters without trying
+        # every alternative.
+        self.regex = re.compile(
+            rf"(?=[{re.escape(first_characters)}])(?:{'|'.join(patterns)})",
+            re.MULTILINE,
+        )
+        self.plain = TextNormalizer() if escape_markdown else self
+        self.replacements: dict[str | None, Callable[[re.Match[str]], str]] = {
+            "url": lambda m: m["url"],
+            "quote_spaces": lambda m: f"\\{m['quote']} ",
+            "quote_whitespace": lambda m: f"\\{m['quote']}{m['quote_whitespace']}",
+            "spaces": lambda _: " ",
+            "before_punctuation": lambda _: "",
+            "dots": self.replace_dots,
+            "markdown": lambda m: f"\\{m['markdown']}",
+            "link": lambda m: f"\\{self.plain(m['link'])}",
+        }
+
+    @staticmethod
+    def replace_dots(match: re.Match[str]) -> str:
+        count = match["dots"].count(".")
+        return "…" * (count // 3) + "." * (count % 3)
+
+    def replace(self, match: re.Match[str]) -> str:
+        return self.replacements[match.lastgroup](match)
+
+    def __call__(self, text: str) -> str:
+        return self.regex.sub(self.replace, text)
+
+
+class TextSplitter:
+    """Split text into the minimum number of chunks no longer than `width`.
+
+    Text is split between words, so entities (escaped markdown, URLs,
+    timestamps, mentions and emojis) are never cut, unless a single word is
+    longer than `width`. Where it doesn't cost an additional chunk, paragraphs,
+    then lines and sentences are preferred as split points, as long as
+    the chunk is at least half full.
+    """
+
+    def __init__(self, width: int) -> None:
+        self.width = width
+
+    def _split_word(self, text: str, start: int, end: int) -> list[Segment]:
+        pieces = []
+        piece_start = start
+
+        for atom in ATOM.finditer(text, start, end):
+            atom_start, atom_end = atom.span()
+            if atom_end - piece_start <= self.width:
+                continue
+
+            if atom_start > piece_start:
+                pieces.append((piece_start, atom_start))
+                piece_start = atom_start
+
+            while atom_end - piece_start > self.width:
+                pieces.append((piece_start, piece_start + self.width))
+                piece_start += self.width
+
+        pieces.append((piece_start, end))
+        return pieces
+
+    def segments(self, text: str) -> list[Segment]:
+        segments = [i.span() for i in WORD.finditer(text)]
+
+        if all(end - start <= self.width for start, end in segments):
+            return segments
+
+        out: list[Segment] = []
+        for start, end in segments:
+            if end - start <= self.width:
+                out.append((start, end))
+            else:
+                out.extend(self._split_word(text, start, end))
+
+        return out
+
+    def _min_chunk_starts(self, starts: list[int], ends: list[int]) -> list[int]:
+        # Element j is the first segment, from which the rest of text still
+        # fits in j chunks. Greedy packing from the end gives these exactly.
+        out = [len(starts)]
+        last = len(starts) - 1
+
+        while last >= 0:
+            first = bisect_left(starts, ends[last] - self.width, 0, last)
+            out.append(first)
+            last = first - 1
+
+        return out
+
+    def _find_split(
+        self, text: str, starts: list[int], ends: list[int], first: int, last: int
+    ) -> int:
+        """Find the best end of the chunk, starting at `first`, in the range of
+        `last` to the last segment, that still fits.
+        """
+        max_last = bisect_right(ends, starts[first] + self.width, last) - 1
+
+        if max_last == len(starts) - 1:
+            return max_last
+
+        gaps_end = starts[max_last + 1]
+        min_fill_last = bisect_left(
+            ends, starts[first] + int(self.width * MIN_CHUNK_FILL), last, max_last
+        )
+
+        if min_fill_last <= max_last:
+            gaps_start = ends[min_fill_last]
+            for separator in ("\n\n", "\n"):
+                if (position := text.rfind(separator, gaps_start, gaps_end)) != -1:
+                    return bisect_right(ends, position, min_fill_last) - 1
+
+            sentence_end = None
+            for match in SENTENCE_END.finditer(text, gaps_start - 1, gaps_end):
+                sentence_end = match.end()
+            if sentence_end is not None:
+                return bisect_left(ends, sentence_end, min_fill_last)
+
+        for i in range(max_last, last - 1, -1):
+            if ends[i] != starts[i + 1]:
+                return i
+
+        return max_last
+
+    def wrap(self, text: str) -> list[str]:
+        segments = self.segments(text)
+        if not segments:
+            return []
+
+        starts, ends = map(list, zip(*segments))
+        min_chunk_starts = self._min_chunk_starts(starts, ends)
+        chunk_count = len(min_chunk_starts) - 1
+
+        chunks = []
+        first = 0
+
+        while first < len(starts):
+            chunks_left = chunk_count - len(chunks) - 1
+            last = max(min_chunk_starts[chunks_left] - 1, first)
+
+            last = self._find_split(text, starts, ends, first, last)
+            chunks.append(text[starts[first] : ends[last]])
+            first = last + 1
+
+        return chunks
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from pytest_httpserver import HTTPServer
+from pytest_mock import MockerFixture
+
+from robomania import config
+from robomania.models.announcement_outbox import AnnouncementOutbox
+from robomania.utils.scraper_client import ScraperClient
+
+
+@pytest.fixture()
+def db() -> AsyncMongoMockClient:
+    return AsyncMongoMockClient().db
+
+
+@pytest.mark.asyncio()
+async def test_add_keeps_order(db) -> None:
+    for post_id in ["3", "1", "2"]:
+        await AnnouncementOutbox.add(db, post_id)
+
+    assert await AnnouncementOutbox.pending(db) == ["3", "1", "2"]
+
+
+@pytest.mark.asyncio()
+async def test_add_is_idempotent(db) -> None:
+    await AnnouncementOutbox.add(db, "1")
+    await AnnouncementOutbox.add(db, "1")
+
+    assert await AnnouncementOutbox.pending(db) == ["1"]
+
+
+@pytest.mark.asyncio()
+async def test_remove(db) -> None:
+    for post_id in ["1", "2", "3"]:
+        await AnnouncementOutbox.add(db, post_id)
+
+    await AnnouncementOutbox.remove(db, ["1", "3"])
+
+    assert await AnnouncementOutbox.pending(db) == ["2"]
+
+
+@pytest.fixture()
+def announcements_cog(
+    db,
+    httpserver: HTTPServer,
+    mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    for name, value in [
+        ("announcements_target_channel", 1),
+        ("time_betweent_announcements_check", 10),
+        ("announcements_prefetch", 3),
+        ("announcements_outbox_retry", 0.05),
+    ]:
+        monkeypatch.setattr(config.settings, name, value, raising=False)
+
+    # Settings are read when the cog module is imported.
+    from robomania.cogs import announcements
+
+    scraper = ScraperClient(httpx.AsyncClient(base_url=httpserver.url_for("/")))
+    mocker.patch.object(ScraperClient, "from_settings", return_value=scraper)
+    monkeypatch.setattr(
+        announcements.Announcements, "_DISABLE_ANNOUNCEMENTS_LOOP", True
+    )
+    bot = mocker.Mock()
+    bot.get_db.return_value = db
+
+    return announcements.Announcements(bot)
+
+
+def posted_ids(httpserver: HTTPServer) -> list[list[str]]:
+    return [
+        json.loads(request.data)["ids"]
+        for request, response in httpserver.log
+        if response.status_code == 200
+    ]
+
+
+@pytest.mark.asyncio()
+async def test_acknowledged_posts_are_flushed(
+    db, httpserver: HTTPServer, announcements_cog
+) -> None:
+    httpserver.expect_request("/posts/posted", method="POST").respond_with_data("")
+
+    await announcements_cog.acknowledge("1")
+    await announcements_cog.acknowledge("2")
+    await announcements_cog.flush_outbox()
+
+    assert sorted(sum(posted_ids(httpserver), [])) == ["1", "2"]
+    assert await AnnouncementOutbox.pending(db) == []
+    assert announcements_cog.scraper.unacknowledged == set()
+
+
+@pytest.mark.asyncio()
+async def test_failed_flush_is_retried(
+    db, httpserver: HTTPServer, announcements_cog
+) -> None:
+    httpserver.expect_oneshot_request("/posts/posted", method="POST").respond_with_data(
+        "", status=500
+    )
+    httpserver.expect_request("/posts/posted", method="POST").respond_with_data("")
+
+    await announcements_cog.acknowledge("1")
+    await announcements_cog.flush_outbox()
+
+    assert await AnnouncementOutbox.pending(db) == ["1"]
+    assert announcements_cog.outbox_retry is not None
+
+    first_flush = announcements_cog.outbox_flush_task
+    await asyncio.sleep(0.1)
+    assert announcements_cog.outbox_flush_task is not first_flush
+    await announcements_cog.outbox_flush_task
+
+    assert posted_ids(httpserver) == [["1"]]
+    assert await AnnouncementOutbox.pending(db) == []
+    assert announcements_cog.scraper.unacknowledged == set()
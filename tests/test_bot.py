@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import pytest
+from pytest_mock import MockerFixture
+
+from robomania import bot as bot_module
+from robomania import config
+
+
+@pytest.fixture()
+def bot(mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch):
+    for name, value in [
+        ("db_url", "mongodb://localhost"),
+        ("db_sync_max_pool_size", 4),
+        ("db_sync_min_pool_size", 0),
+        ("environment", ""),
+        ("db_compressors", ("zstd", "snappy", "zlib")),
+        ("db_max_idle_time_ms", 60_000),
+        ("db_read_preference", "secondaryPreferred"),
+    ]:
+        monkeypatch.setattr(config.settings, name, value, raising=False)
+
+    bot = bot_module.bot
+    monkeypatch.setattr(bot, "client", {"robomania": "async db"}, raising=False)
+    monkeypatch.setattr(bot, "_sync_client", None)
+    return bot
+
+
+def test_sync_client_is_created_once(bot, mocker: MockerFixture) -> None:
+    client = mocker.patch.object(bot_module, "MongoClient")
+
+    assert bot.sync_client is bot.sync_client
+    client.assert_called_once()
+    assert client.call_args.args == ("mongodb://localhost",)
+    assert client.call_args.kwargs["maxPoolSize"] == 4
+    assert client.call_args.kwargs["event_listeners"] == bot.mongo_monitor.listeners
+
+
+def test_mongo_client_options(bot, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        bot_module,
+        "find_spec",
+        lambda name: name == "zlib",
+    )
+
+    options = bot.mongo_client_options()
+
+    assert options["compressors"] == ["zlib"]
+    assert options["maxIdleTimeMS"] == 60_000
+    assert options["readPreference"] == "secondaryPreferred"
+
+
+def test_compression_is_opt_in(bot, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config.settings, "db_compressors", (), raising=False)
+
+    assert "compressors" not in bot.mongo_client_options()
+
+
+def test_blocking_db_does_not_replace_async_client(bot, mocker: MockerFixture) -> None:
+    client = mocker.patch.object(bot_module, "MongoClient")
+
+    blocking_db = bot.get_db("robomania", blocking=True)
+
+    assert blocking_db is client.return_value["robomania"]
+    assert bot.get_db("robomania") == "async db"
+
+
+@pytest.fixture()
+def command_sync(bot, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch):
+    from robomania.models.command_sync import CommandSyncState
+
+    monkeypatch.setattr(
+        config.settings, "skip_unchanged_command_sync", True, raising=False
+    )
+    monkeypatch.setattr(bot._connection, "application_id", 1)
+    mocker.patch.object(bot, "wait_until_first_connect", mocker.AsyncMock())
+    mocker.patch.object(bot, "_cache_application_commands", mocker.AsyncMock())
+    mocker.patch.object(bot, "_sync_application_commands", mocker.AsyncMock())
+    mocker.patch.object(CommandSyncState, "get_hash", mocker.AsyncMock())
+    mocker.patch.object(CommandSyncState, "set_hash", mocker.AsyncMock())
+    return CommandSyncState
+
+
+def test_hash_payload_ignores_key_order() -> None:
+    assert bot_module.hash_payload({"a": 1, "b": [2]}) == bot_module.hash_payload(
+        {"b": [2], "a": 1}
+    )
+    assert bot_module.hash_payload({"a": 1}) != bot_module.hash_payload({"a": 2})
+
+
+@pytest.mark.asyncio()
+async def test_unchanged_commands_are_not_synced(bot, command_sync) -> None:
+    command_sync.get_hash.return_value = bot_module.hash_payload(bot.command_payload())
+
+    await bot._prepare_application_commands()
+
+    bot._cache_application_commands.assert_not_awaited()
+    bot._sync_application_commands.assert_not_awaited()
+    command_sync.set_hash.assert_not_awaited()
+
+
+@pytest.mark.asyncio()
+async def test_changed_commands_are_synced(bot, command_sync, mocker) -> None:
+    command_sync.get_hash.return_value = "stale"
+    mocker.patch.object(bot, "global_commands_synced", return_value=True)
+
+    await bot._prepare_application_commands()
+
+    bot._sync_application_commands.assert_awaited_once()
+    command_sync.set_hash.assert_awaited_once_with(
+        "async db", 1, bot_module.hash_payload(bot.command_payload())
+    )
+
+
+@pytest.mark.asyncio()
+async def test_failed_sync_is_not_recorded(bot, command_sync, mocker) -> None:
+    command_sync.get_hash.side_effect = RuntimeError
+    mocker.patch.object(bot, "global_commands_synced", return_value=False)
+
+    await bot._prepare_application_commands()
+
+    bot._sync_application_commands.assert_awaited_once()
+    command_sync.set_hash.assert_not_awaited()
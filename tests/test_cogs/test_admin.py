@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+from pytest_mock import MockerFixture
+
+from robomania import config
+
+
+@pytest.fixture()
+def cog(mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config.settings, "admin_guild_ids", (413,), raising=False)
+    # Settings are read when the cog module is imported.
+    from robomania.cogs import admin
+
+    bot = mocker.Mock()
+    bot.reload_locale = mocker.AsyncMock()
+    return admin.Admin(bot)
+
+
+@pytest.fixture()
+def inter(mocker: MockerFixture):
+    inter = mocker.Mock()
+    inter.response.defer = mocker.AsyncMock()
+    inter.send = mocker.AsyncMock()
+    return inter
+
+
+def test_reload_locale_is_guild_scoped(cog) -> None:
+    assert cog.reload_locale.guild_ids == (413,)
+
+
+@pytest.mark.asyncio()
+async def test_reload_locale_reports_success(cog, inter) -> None:
+    await cog.reload_locale.callback(cog, inter)
+
+    cog.bot.reload_locale.assert_awaited_once()
+    embed = inter.send.await_args.kwargs["embed"]
+    assert embed.description.startswith("Locale reloaded")
+    assert inter.send.await_args.kwargs["ephemeral"] is True
+
+
+@pytest.mark.asyncio()
+async def test_reload_locale_reports_error(cog, inter) -> None:
+    cog.bot.reload_locale.side_effect = ValueError("broken pl.json")
+
+    await cog.reload_locale.callback(cog, inter)
+
+    embed = inter.send.await_args.kwargs["embed"]
+    assert "broken pl.json" in embed.description
+    assert inter.send.await_args.kwargs["ephemeral"] is True
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from datetime import datetime, timedelta, timezone
+
+import disnake
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from pytest_mock import MockerFixture
+
+from robomania import config
+from robomania.models.poll_model import PollModel
+
+BOT_ID = 1000
+
+
+@pytest.fixture()
+def db() -> AsyncMongoMockClient:
+    return AsyncMongoMockClient().db
+
+
+@pytest.fixture()
+def bot(db, mocker: MockerFixture):
+    bot = mocker.Mock()
+    bot.user.id = BOT_ID
+    bot.get_db.return_value = db
+    bot.wait_until_ready = mocker.AsyncMock()
+    bot.localize.side_effect = lambda locale: contextlib.nullcontext()
+    bot.template.return_value.render.return_value = "Results"
+    channel = bot.get_partial_messageable.return_value
+    channel.get_partial_message.return_value.reply = mocker.AsyncMock()
+    return bot
+
+
+@pytest.fixture()
+def cog(bot, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config.settings, "poll_snapshot_interval", 60, raising=False)
+    monkeypatch.setattr(config.settings, "poll_open_ended_ttl", 3600, raising=False)
+    # Settings are read when the cog module is imported.
+    from robomania.cogs import poll
+
+    cog = poll.Poll(bot)
+    yield cog
+    for task in cog.close_tasks.values():
+        task.cancel()
+
+
+def make_poll(created_at: datetime | None = None, **kwargs) -> PollModel:
+    message_id = disnake.utils.time_snowflake(created_at or datetime.now(timezone.utc))
+    return PollModel(
+        message_id, 2, 3, "pl", "Lorem?", ["ipsum", "dolor"], ["👍", "👎"], **kwargs
+    )
+
+
+@pytest.fixture()
+def new_poll() -> PollModel:
+    return make_poll()
+
+
+def reaction(mocker: MockerFixture, user_id: int, emoji: str, message_id: int):
+    return mocker.Mock(message_id=message_id, user_id=user_id, emoji=emoji)
+
+
+@pytest.mark.asyncio()
+async def test_new_poll_is_saved_immediately(db, cog, new_poll: PollModel) -> None:
+    await cog.add_poll(new_poll)
+
+    restored = await PollModel.get_open(db, cog.open_ended_since())
+    assert [i.message_id for i in restored] == [new_poll.message_id]
+    assert cog.dirty == set()
+
+
+@pytest.mark.asyncio()
+async def test_reactions_are_tallied(
+    db, cog, new_poll: PollModel, mocker: MockerFixture
+) -> None:
+    await cog.add_poll(new_poll)
+    poll_id = new_poll.message_id
+
+    await cog.on_raw_reaction_add(reaction(mocker, 10, "👍", poll_id))
+    await cog.on_raw_reaction_add(reaction(mocker, 11, "👍", poll_id))
+    await cog.on_raw_reaction_add(reaction(mocker, 11, "👎", poll_id))
+    await cog.on_raw_reaction_remove(reaction(mocker, 11, "👍", poll_id))
+    await cog.on_raw_reaction_add(reaction(mocker, BOT_ID, "👎", poll_id))
+    await cog.on_raw_reaction_add(reaction(mocker, 12, "👍", poll_id + 1))
+
+    assert cog.dirty == {poll_id}
+    await cog.save_dirty_polls()
+
+    (saved,) = await PollModel.get_open(db, cog.open_ended_since())
+    assert saved.counts == [1, 1]
+    assert cog.dirty == set()
+
+
+@pytest.mark.asyncio()
+async def test_close_poll(
+    db, bot, cog, new_poll: PollModel, mocker: MockerFixture
+) -> None:
+    await cog.add_poll(new_poll)
+    await cog.on_raw_reaction_add(reaction(mocker, 10, "👎", new_poll.message_id))
+
+    await cog.close_poll(new_poll)
+
+    assert cog.polls == {}
+    assert await PollModel.get_open(db, cog.open_ended_since()) == []
+    reply = bot.get_partial_messageable.return_value.get_partial_message
+    reply.assert_called_once_with(new_poll.message_id)
+    text = reply.return_value.reply.await_args.args[0]
+    assert text.startswith("Results")
+    assert "👍 ipsum: 0" in text
+    assert "👎 dolor: 1" in text
+
+
+@pytest.mark.asyncio()
+async def test_open_polls_are_restored(
+    db, cog, new_poll: PollModel, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(cog.snapshot_polls, "start")
+    new_poll.vote("👍", 10)
+    new_poll.closes_at = datetime.now(timezone.utc) + timedelta(milliseconds=10)
+    await new_poll.save(db)
+    await make_poll(closed=True).save(db)
+    await make_poll(datetime.now(timezone.utc) - timedelta(days=1)).save(db)
+
+    await cog.cog_load()
+
+    assert list(cog.polls) == [new_poll.message_id]
+    assert cog.polls[new_poll.message_id].counts == [1, 0]
+
+    await asyncio.wait_for(cog.close_tasks[new_poll.message_id], 1)
+    assert await PollModel.get_open(db, cog.open_ended_since()) == []
+
+
+@pytest.mark.asyncio()
+async def test_expired_open_ended_polls_are_dropped(cog) -> None:
+    old = make_poll(datetime.now(timezone.utc) - timedelta(days=1))
+    timed = make_poll(
+        datetime.now(timezone.utc) - timedelta(days=1),
+        closes_at=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    recent = make_poll()
+    for i in (old, timed, recent):
+        cog.polls[i.message_id] = i
+
+    cog.drop_expired_polls()
+
+    assert set(cog.polls) == {timed.message_id, recent.message_id}
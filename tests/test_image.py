@@ -147,3 +147,44 @@ def test_reduce_size_cannot_reduce_enough(mocker: MockerFixture) -> None:
 
     with pytest.raises(ValueError, match="below given size"):
         img.reduce_size(100)
+
+
+@pytest.mark.parametrize(
+    ("sizes", "allow_reordering", "result"),
+    [
+        ([5000, 5000, 3000, 3000], True, [[0, 2], [1, 3]]),
+        ([5000, 5000, 3000, 3000], False, [[0], [1, 2], [3]]),
+        ([500, 7800, 200], True, [[0], [1, 2]]),
+    ],
+)
+def test_prepare_images_reordering(
+    sizes: list[int],
+    allow_reordering: bool,
+    result: list[list[int]],
+    mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(image, "MAX_TOTAL_SIZE_OF_IMAGES", 8 * 1024)
+
+    class MockDiscordPostImage(image.Image):
+        image = mocker.Mock(spec=io.BytesIO)
+
+        def __init__(self, index: int) -> None:
+            self.name = str(index)
+
+        @property
+        def size(self) -> int:
+            return sizes[int(self.name)]
+
+    images = list(map(MockDiscordPostImage, range(len(sizes))))
+    image_split = image.Image.prepare_images(images, allow_reordering=allow_reordering)
+
+    assert [[int(f.filename) for f in group] for group in image_split] == result
+
+
+def test_prepare_images_does_not_consume_input(img: image.Image) -> None:
+    images = [img]
+
+    list(image.Image.prepare_images(images))
+
+    assert images == [img]
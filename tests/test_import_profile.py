@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from robomania.utils.import_profile import (
+    ImportTime,
+    format_report,
+    parse_import_times,
+    profile_imports,
+)
+
+REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _json
+import time:       800 |        920 |   json.decoder
+import time:       300 |       1220 | json
+unrelated line
+"""
+
+
+def test_parse_import_times() -> None:
+    assert parse_import_times(REPORT) == [
+        ImportTime("_json", 120, 120, 2),
+        ImportTime("json.decoder", 800, 920, 1),
+        ImportTime("json", 300, 1220, 0),
+    ]
+
+
+def test_format_report() -> None:
+    report = format_report(parse_import_times(REPORT), limit=2).splitlines()
+
+    assert report[1].split() == ["json", "1.2", "0.3"]
+    assert report[2].split() == ["json.decoder", "0.9", "0.8"]
+    assert report[-1] == "3 modules imported in 1.2 ms"
+    assert len(report) == 4
+
+
+def test_profile_imports() -> None:
+    modules = {i.module for i in profile_imports(["json"])}
+
+    assert "json" in modules
+
+
+def test_heavy_imports_are_deferred() -> None:
+    modules = {
+        i.module
+        for i in profile_imports(
+            ["robomania.cogs.planner", "robomania.cogs.dice.grammar"]
+        )
+    }
+
+    assert "robomania.cogs.dice.grammar" in modules
+    assert "pytesseract" not in modules
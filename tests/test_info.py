@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+
+import disnake
+import pytest
+from pytest_mock import MockerFixture
+
+from robomania import config
+
+
+@pytest.fixture()
+def info(monkeypatch: pytest.MonkeyPatch):
+    for name, value in [
+        ("assets_base_url", "https://example.org/"),
+        ("default_locale", disnake.Locale.en_GB),
+        ("available_locales", ("pl", "en-GB")),
+    ]:
+        monkeypatch.setattr(config.settings, name, value, raising=False)
+
+    from robomania.cogs import info
+
+    return info
+
+
+@pytest.fixture()
+def cog(info, mocker: MockerFixture):
+    return info.Info(mocker.Mock())
+
+
+@pytest.fixture()
+def inter(mocker: MockerFixture):
+    inter = mocker.Mock()
+    inter.locale = disnake.Locale.pl
+    inter.send = mocker.AsyncMock()
+    return inter
+
+
+def test_embeds_are_built_per_locale(info, cog) -> None:
+    assert set(cog.embeds) == {
+        (name, locale)
+        for name in info.EMBED_BUILDERS
+        for locale in (disnake.Locale.pl, disnake.Locale.en_GB)
+    }
+
+    with pytest.raises(TypeError):
+        cog.embeds["fundraiser", disnake.Locale.pl] = disnake.Embed()
+
+
+@pytest.mark.asyncio()
+async def test_unavailable_locale_uses_default(cog, inter) -> None:
+    inter.locale = disnake.Locale.ja
+
+    await cog.fundraiser.callback(cog, inter)
+
+    cached = cog.embeds["fundraiser", disnake.Locale.en_GB]
+    sent = inter.send.await_args.kwargs["embed"]
+    assert sent is not cached
+    assert sent.to_dict() == cached.to_dict()
+
+
+@pytest.mark.asyncio()
+async def test_locale_reload_rebuilds_embeds(cog) -> None:
+    embeds = cog.embeds
+
+    await cog.on_locale_reload()
+
+    assert cog.embeds is not embeds
+    assert cog.embeds.keys() == embeds.keys()
+
+
+@pytest.mark.asyncio()
+async def test_cached_handler_benchmark(info, cog, inter) -> None:
+    from robomania.bot import Robomania
+
+    async def uncached_handler(inter) -> None:
+        with Robomania.localize(inter.locale) as tr:
+            embed = disnake.Embed.from_dict(info.address_embed(tr))
+        await inter.send(embed=embed)
+
+    async def cached_handler(inter) -> None:
+        await cog.address.callback(cog, inter)
+
+    async def send(embed: disnake.Embed) -> None:
+        pass
+
+    # A mock would keep every sent embed alive and slow down the later run.
+    inter.send = send
+
+    async def measure(handler) -> float:
+        start = time.perf_counter()
+        for _ in range(2000):
+            await handler(inter)
+        return time.perf_counter() - start
+
+    uncached = await measure(uncached_handler)
+    cached = await measure(cached_handler)
+
+    assert cached < uncached
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+
+import disnake
+import pytest
+from pytest_mock import MockerFixture
+
+from robomania import config
+from robomania.bot import Robomania, bot
+from robomania.locale import (
+    DefaultLocale,
+    Template,
+    compile_templates,
+    compile_translations,
+    load_localizations,
+    locale_signature,
+)
+from robomania.utils.exceptions import TemplateError
+
+
+@pytest.fixture()
+def locale_path(tmp_path: Path) -> Path:
+    (tmp_path / "pl.json").write_text(
+        json.dumps({"HELLO": "Cześć", "DIVISION_BY_ZERO": "Dzielenie przez 0."})
+    )
+    (tmp_path / "en_GB.json").write_text(json.dumps({"HELLO": "Hello", "NULL": None}))
+    return tmp_path
+
+
+def test_load_localizations(locale_path: Path) -> None:
+    assert load_localizations(locale_path) == {
+        "HELLO": {"pl": "Cześć", "en-GB": "Hello"},
+        "DIVISION_BY_ZERO": {"pl": "Dzielenie przez 0."},
+    }
+
+
+def test_compile_translations_merges_defaults(locale_path: Path) -> None:
+    table = compile_translations(
+        load_localizations(locale_path), [disnake.Locale.pl, disnake.Locale.en_GB]
+    )
+
+    assert table[disnake.Locale.pl, "HELLO"] == "Cześć"
+    assert table[disnake.Locale.pl, "DIVISION_BY_ZERO"] == "Dzielenie przez 0."
+    assert table[disnake.Locale.en_GB, "DIVISION_BY_ZERO"] == DefaultLocale.get(
+        "DIVISION_BY_ZERO"
+    )
+    assert (disnake.Locale.en_GB, "NULL") not in table
+
+
+def test_tr(
+    locale_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(
+        Robomania,
+        "translations",
+        compile_translations(load_localizations(locale_path), [disnake.Locale.pl]),
+    )
+    monkeypatch.setattr(Robomania, "_missing_translations", set())
+    token = Robomania._current_locale.set(disnake.Locale.pl)
+
+    try:
+        with caplog.at_level(logging.WARNING):
+            assert Robomania.tr("HELLO") == "Cześć"
+            assert Robomania.tr("MISSING", "default") == "default"
+            assert Robomania.tr("MISSING") == "MISSING"
+    finally:
+        Robomania._current_locale.reset(token)
+
+    assert len(caplog.records) == 1
+
+
+def test_template_render() -> None:
+    template = Template('{user} asked: "{question!r:>8}"', ("user", "question"))
+
+    assert template.render(user="Lorem", question="why") == "Lorem asked: \"   'why'\""
+    assert Template("Lorem ipsum").render() == "Lorem ipsum"
+
+
+@pytest.mark.parametrize(
+    "text", ["{unknown}", "{0}", "{}", "{user.name}", "{user:{w}}"]
+)
+def test_template_rejects_placeholders(text: str) -> None:
+    with pytest.raises(TemplateError):
+        Template(text, ("user",))
+
+
+def test_invalid_template_uses_default() -> None:
+    translations = {
+        (disnake.Locale.pl, "POLL_RESULTS_TEMPLATE"): "{pytanie}",
+        (disnake.Locale.pl, "HELLO"): "{not_a_template}",
+    }
+
+    table = compile_templates(translations)
+
+    assert list(table) == [(disnake.Locale.pl, "POLL_RESULTS_TEMPLATE")]
+    assert table[disnake.Locale.pl, "POLL_RESULTS_TEMPLATE"].render(
+        question="Lorem"
+    ) == DefaultLocale.get("POLL_RESULTS_TEMPLATE").format(question="Lorem")
+
+
+def test_template_render_is_fast() -> None:
+    template = Template(
+        DefaultLocale.get("POLL_CREATE_MESSAGE_TEMPLATE"), ("user", "question")
+    )
+
+    count = 100_000
+    start = time.perf_counter()
+    for _ in range(count):
+        template.render(user="<@413>", question="Lorem ipsum?")
+    elapsed = (time.perf_counter() - start) / count
+
+    print(f"Template render: {elapsed * 1e9:.0f} ns")
+    assert elapsed < 1e-6
+
+
+@pytest.fixture()
+def reloadable_bot(
+    locale_path: Path, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+) -> Robomania:
+    monkeypatch.setattr(config.settings, "available_locales", ("pl",), raising=False)
+    monkeypatch.setattr(
+        config.settings, "default_locale", disnake.Locale.pl, raising=False
+    )
+    for name in ("translations", "templates", "_missing_translations"):
+        monkeypatch.setattr(Robomania, name, getattr(Robomania, name))
+    monkeypatch.setattr(bot, "i18n", bot.i18n)
+    monkeypatch.setattr(bot, "locale_path", locale_path, raising=False)
+    mocker.patch.object(bot, "dispatch")
+    return bot
+
+
+def test_locale_signature_changes_on_edit(locale_path: Path) -> None:
+    signature = locale_signature(locale_path)
+    assert [i[0] for i in signature] == ["en_GB.json", "pl.json"]
+
+    (locale_path / "pl.json").write_text(json.dumps({"HELLO": "Hej"}))
+
+    assert locale_signature(locale_path) != signature
+
+
+@pytest.mark.asyncio()
+async def test_reload_locale(reloadable_bot: Robomania, locale_path: Path) -> None:
+    (locale_path / "pl.json").write_text(json.dumps({"HELLO": "Hej"}))
+    old_i18n = reloadable_bot.i18n
+
+    await reloadable_bot.reload_locale()
+
+    assert Robomania.translations[disnake.Locale.pl, "HELLO"] == "Hej"
+    assert reloadable_bot.i18n is not old_i18n
+    assert reloadable_bot.i18n.get("HELLO") == {"pl": "Hej", "en-GB": "Hello"}
+    reloadable_bot.dispatch.assert_called_once_with("locale_reload")
+
+
+@pytest.mark.asyncio()
+async def test_reload_locale_keeps_translations_on_error(
+    reloadable_bot: Robomania, locale_path: Path
+) -> None:
+    await reloadable_bot.reload_locale()
+    translations = Robomania.translations
+    (locale_path / "pl.json").write_text("{")
+
+    with pytest.raises(json.JSONDecodeError):
+        await reloadable_bot.reload_locale()
+
+    assert Robomania.translations is translations
+    assert reloadable_bot.dispatch.call_count == 1
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from robomania.utils.logs import (
+    JsonFormatter,
+    QueueLogging,
+    SamplingFilter,
+    file_handler,
+)
+
+
+def make_record(name: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, "message", None, None)
+
+
+@pytest.fixture()
+def test_logger() -> Iterator[logging.Logger]:
+    logger = logging.getLogger("robomania.test_logs")
+    logger.propagate = False
+    yield logger
+    logger.handlers.clear()
+    logger.propagate = True
+
+
+def test_json_formatter() -> None:
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        record = logging.LogRecord(
+            "robomania", logging.ERROR, __file__, 1, "Failed %s", ("x",), sys.exc_info()
+        )
+
+    data = json.loads(JsonFormatter().format(record))
+
+    assert data["level"] == "ERROR"
+    assert data["logger"] == "robomania"
+    assert data["message"] == "Failed x"
+    assert "ZeroDivisionError" in data["exception"]
+
+
+def test_sampling_filter() -> None:
+    sampling = SamplingFilter({"disnake": 0.25, "disnake.http": 0})
+
+    gateway = [sampling.filter(make_record("disnake.gateway")) for _ in range(8)]
+    assert gateway.count(True) == 2
+
+    assert not sampling.filter(make_record("disnake.http"))
+    assert sampling.filter(make_record("disnake.http", logging.ERROR))
+    assert all(sampling.filter(make_record("robomania")) for _ in range(3))
+
+
+def test_queue_logging_writes_in_background(
+    tmp_path: Path, test_logger: logging.Logger
+) -> None:
+    logs = QueueLogging(json_lines=True)
+    logs.attach(test_logger, logging.INFO, file_handler(tmp_path / "test.log"))
+
+    values = ["before"]
+    test_logger.info("value: %s", values)
+    values[0] = "after"
+    test_logger.debug("dropped")
+    logs.stop()
+
+    lines = (tmp_path / "test.log").read_text("utf-8").splitlines()
+    assert [json.loads(i)["message"] for i in lines] == ["value: ['before']"]
+
+
+def test_file_handler_rotates(tmp_path: Path, test_logger: logging.Logger) -> None:
+    logs = QueueLogging()
+    handler = file_handler(tmp_path / "test.log", max_bytes=200, backup_count=2)
+    logs.attach(test_logger, logging.INFO, handler)
+
+    for i in range(20):
+        test_logger.info(f"record {i}")
+    logs.stop()
+
+    assert sorted(i.name for i in tmp_path.iterdir()) == [
+        "test.log",
+        "test.log.1",
+        "test.log.2",
+    ]
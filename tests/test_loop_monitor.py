@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from robomania.utils.healthcheck import HealthcheckClient
+from robomania.utils.loop_monitor import LoopLagMonitor
+
+
+def test_quantiles() -> None:
+    monitor = LoopLagMonitor(window=100)
+    assert monitor.p99 == 0
+
+    monitor.samples.extend(i / 100 for i in range(100))
+
+    assert monitor.p50 == 0.5
+    assert monitor.p99 == 0.99
+
+
+def test_window_is_bounded() -> None:
+    monitor = LoopLagMonitor(window=10)
+    monitor.samples.extend([1.0] * 5 + [0.0] * 10)
+
+    assert monitor.p99 == 0
+
+
+@pytest.mark.asyncio()
+async def test_blocking_is_measured_and_reported(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.1)
+    monitor.start()
+
+    def block_loop() -> None:
+        time.sleep(0.3)
+
+    with caplog.at_level(logging.WARNING, "robomania.loop_monitor"):
+        await asyncio.sleep(0.02)
+        block_loop()
+        await asyncio.sleep(0.05)
+    monitor.stop()
+
+    assert max(monitor.samples) >= 0.2
+    assert monitor.max_lag() >= 0.2
+    blocked = [i.message for i in caplog.records if "is blocked" in i.message]
+    assert len(blocked) == 1
+    assert "block_loop" in blocked[0]
+
+
+@pytest.mark.asyncio()
+async def test_healthcheck_fails_on_loop_lag(mocker: MockerFixture) -> None:
+    monitor = LoopLagMonitor()
+    bot = mocker.Mock(latency=0.1, loop_monitor=monitor)
+    bot.is_ready.return_value = True
+    bot.is_closed.return_value = False
+    client = HealthcheckClient(bot, mocker.Mock(), max_loop_lag=1)
+
+    monitor.samples.extend([0.01] * 10)
+    assert (await client.healthcheck(mocker.Mock())).status == 200
+
+    monitor.samples.extend([2.0] * 10)
+    assert (await client.healthcheck(mocker.Mock())).status != 200
+
+
+@pytest.mark.asyncio()
+async def test_healthcheck_fails_on_recent_stall(mocker: MockerFixture) -> None:
+    monitor = LoopLagMonitor(interval=0.001, window=1000, threshold=0.1)
+    bot = mocker.Mock(latency=0.1, loop_monitor=monitor)
+    bot.is_ready.return_value = True
+    bot.is_closed.return_value = False
+    client = HealthcheckClient(bot, mocker.Mock(), max_loop_lag=0.2)
+
+    monitor.samples.extend([0.0] * 1000)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.3)
+    await asyncio.sleep(0.05)
+
+    # A single sample doesn't move p99, the stall still fails the check.
+    assert monitor.p99 < 0.2
+    assert (await client.healthcheck(mocker.Mock())).status != 200
+
+    # Window of samples covers 1 second.
+    await asyncio.sleep(1.1)
+    monitor.stop()
+    assert (await client.healthcheck(mocker.Mock())).status == 200
+
+
+def test_current_stall_counts_as_lag(mocker: MockerFixture) -> None:
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.last_tick = time.monotonic() - 2
+    assert monitor.max_lag() == 0
+
+    # Only a started monitor is waiting for a tick.
+    monitor.handle = mocker.Mock()
+    assert monitor.max_lag() >= 1.9
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import math
+import time
+from datetime import datetime
+
+import disnake
+import pytest
+from faker import Faker
+from pytest_mock import MockerFixture
+
+from robomania.types import message
+from robomania.utils.rate_limit import TokenBucket
+
+
+def http_error(
+    mocker: MockerFixture, status: int, code: int = 0, retry_after: str | None = None
+) -> disnake.HTTPException:
+    headers = {} if retry_after is None else {"Retry-After": retry_after}
+    response = mocker.Mock(status=status, reason="", headers=headers)
+    return disnake.HTTPException(response, {"code": code, "message": ""})
+
+
+@pytest.fixture()
+def channel(mocker: MockerFixture):
+    channel = mocker.Mock(spec=disnake.TextChannel)
+    channel.id = 413
+    channel.send = mocker.AsyncMock()
+    return channel
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("status", [403, 500])
+async def test_failed_send_is_not_repeated(
+    channel, mocker: MockerFixture, status: int
+) -> None:
+    # disnake retries rate limits and server errors itself.
+    channel.send.side_effect = http_error(mocker, status)
+
+    with pytest.raises(disnake.HTTPException):
+        await message.Message("Lorem ipsum").send(channel)
+
+    channel.send.assert_awaited_once()
+
+
+@pytest.mark.asyncio()
+async def test_separate_embeds_when_too_big(channel, mocker: MockerFixture) -> None:
+    embeds = [disnake.Embed(description="Lorem ipsum")]
+    channel.send.side_effect = [http_error(mocker, 400, 50035), None, None]
+
+    await message.Message("Lorem ipsum", embeds=embeds).send(channel)
+
+    assert channel.send.await_args_list[1].kwargs["embeds"] == []
+    assert channel.send.await_args_list[2].kwargs["embeds"] == embeds
+
+
+@pytest.mark.asyncio()
+async def test_failed_separate_embeds_are_raised(
+    channel, mocker: MockerFixture
+) -> None:
+    embeds = [disnake.Embed(description="Lorem ipsum")]
+    channel.send.side_effect = [
+        http_error(mocker, 400, 50035),
+        None,
+        http_error(mocker, 500),
+    ]
+
+    with pytest.raises(disnake.HTTPException):
+        await message.Message("Lorem ipsum", embeds=embeds).send(channel)
+
+    sent = [i.args[0] if i.args else None for i in channel.send.await_args_list]
+    assert sent == ["Lorem ipsum", "Lorem ipsum", None]
+
+
+@pytest.mark.asyncio()
+async def test_scheduler_future_carries_failure(channel, mocker: MockerFixture) -> None:
+    channel.send.side_effect = [http_error(mocker, 403), None]
+    scheduler = message.SendScheduler()
+
+    failed = scheduler.schedule([message.Message("Lorem")], channel)
+    sent = scheduler.schedule([message.Message("ipsum")], channel)
+
+    with pytest.raises(disnake.HTTPException):
+        await failed
+    await sent
+    assert channel.send.await_count == 2
+
+
+@pytest.mark.asyncio()
+async def test_rest_of_job_is_dropped_after_failure(
+    channel, mocker: MockerFixture
+) -> None:
+    channel.send.side_effect = [None, http_error(mocker, 403), None]
+    builder = (
+        message.MessageBuilder()
+        .add_text("Lorem")
+        .new_message()
+        .add_text("ipsum")
+        .new_message()
+        .add_text("dolor")
+    )
+
+    with pytest.raises(disnake.HTTPException):
+        await builder.send(channel)
+
+    assert [i.args[0] for i in channel.send.await_args_list] == ["Lorem", "ipsum"]
+
+
+def test_rate_limits_handled_by_disnake_are_counted() -> None:
+    http_logger = logging.getLogger("disnake.http")
+    before = message.rate_limited.value()
+
+    http_logger.warning(
+        "We are being rate limited. Retrying in %.2f seconds. "
+        'Handled under the bucket "%s"',
+        1.5,
+        "bucket",
+    )
+    http_logger.warning(
+        "Global rate limit has been hit. Retrying in %.2f seconds.", 1.5
+    )
+
+    assert message.rate_limited.value() == before + 1
+
+
+@pytest.mark.asyncio()
+async def test_files_are_rewound_when_too_big(channel, mocker: MockerFixture) -> None:
+    image = message.Image(io.BytesIO(b"image"), "image.png")
+    embeds = [disnake.Embed(description="Lorem ipsum")]
+    read: list[bytes] = []
+
+    async def send(*args, files=(), **kwargs) -> None:
+        if files:
+            read.append(files[0].fp.read())
+        if len(read) == 1 and kwargs["embeds"]:
+            raise http_error(mocker, 413)
+
+    channel.send.side_effect = send
+
+    await message.Message(images=[image], embeds=embeds).send(channel)
+
+    assert read == [b"image", b"image"]
+
+
+@pytest.mark.asyncio()
+async def test_scheduler_keeps_order(channel, mocker: MockerFixture) -> None:
+    sent: list[str] = []
+
+    async def send(text, **kwargs) -> None:
+        await asyncio.sleep(0.001 * (5 - len(sent)))
+        sent.append(text)
+
+    channel.send.side_effect = send
+    scheduler = message.SendScheduler()
+
+    futures = [scheduler.schedule([message.Message(str(i))], channel) for i in range(5)]
+    await asyncio.gather(*futures)
+
+    assert sent == ["0", "1", "2", "3", "4"]
+    assert scheduler.queues == {}
+
+
+@pytest.mark.asyncio()
+async def test_interaction_response_skips_channel_queue(
+    channel, mocker: MockerFixture
+) -> None:
+    scheduler = message.SendScheduler()
+    bucket = scheduler.buckets[channel.id] = TokenBucket(
+        message.CHANNEL_SEND_RATE, message.CHANNEL_SEND_PER
+    )
+    bucket.block_for(10)
+    queued = scheduler.schedule([message.Message("Lorem")], channel)
+
+    inter = mocker.Mock(spec=disnake.ApplicationCommandInteraction)
+    inter.channel_id = channel.id
+    inter.response.is_done.return_value = False
+    inter.send = mocker.AsyncMock()
+
+    await asyncio.wait_for(scheduler.schedule([message.Message("ipsum")], inter), 1)
+
+    inter.send.assert_awaited_once()
+    channel.send.assert_not_awaited()
+    queued.cancel()
+    scheduler.workers[channel.id].cancel()
+
+
+@pytest.mark.asyncio()
+async def test_builder_messages_are_one_job(channel, mocker: MockerFixture) -> None:
+    sent: list[str] = []
+
+    async def send(text, **kwargs) -> None:
+        await asyncio.sleep(0.001)
+        sent.append(text)
+
+    channel.send.side_effect = send
+    first = message.MessageBuilder().add_text("1").new_message().add_text("2")
+    second = message.MessageBuilder().add_text("3")
+
+    await asyncio.gather(first.send(channel), second.send(channel))
+
+    assert sent == ["1", "2", "3"]
+
+
+@pytest.mark.asyncio()
+async def test_token_bucket_paces_requests() -> None:
+    bucket = TokenBucket(2, 0.1)
+
+    start = time.perf_counter()
+    for _ in range(4):
+        await bucket.acquire()
+    elapsed = time.perf_counter() - start
+
+    assert 0.09 <= elapsed < 0.5
+
+
+def test_pack_embeds_respects_limits() -> None:
+    embeds = [disnake.Embed(description="a" * 2500) for _ in range(5)]
+    embeds += [disnake.Embed(description="a") for _ in range(15)]
+
+    groups = message.pack_embeds(embeds)
+
+    assert [len(i) for i in groups] == [2, 2, 10, 6]
+    assert all(sum(map(len, i)) <= 6000 for i in groups)
+
+
+def test_embed_layout_fills_messages(faker: Faker) -> None:
+    text = faker.text(1000)
+    while len(text) < 20000:
+        text += " " + faker.text(1000)
+    timestamp = datetime(2023, 1, 1)
+
+    embeds = message.EmbedLayout("Author", 0xF4E152, timestamp)(text)
+    groups = message.pack_embeds(embeds)
+
+    assert len(groups) == math.ceil(len(text) / 6000)
+    assert all(len(i.description or "") <= 4096 for i in embeds)
+    assert all(sum(map(len, i)) <= 6000 for i in groups)
+    assert embeds[0].author.name == "Author"
+    assert embeds[0].colour == disnake.Colour(0xF4E152)
+    assert embeds[-1].timestamp == timestamp.astimezone()
+
+
+def test_embed_layout_short_text() -> None:
+    embeds = message.EmbedLayout("Author")("Lorem ipsum")
+
+    assert len(embeds) == 1
+    assert embeds[0].description == "Lorem ipsum"
+
+
+def test_markdown_escaping_text_processor() -> None:
+    text = "  Lorem  Ipsum... -+  abc .*abc*  "
+
+    assert message.MarkdownEscapingTextProcessor()(text) == [
+        r"Lorem Ipsum…-+ abc.\*abc\*"
+    ]
+
+
+def test_long_text_wrapping(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(message.TextProcessor.wrapper, "width", 50)
+    monkeypatch.setattr(message, "MAX_CHARACTERS_PER_POST", 50)
+
+    text = (
+        "Sit sunt culpa duis enim occaecat anim eiusmod proident nulla. "
+        "Qui labore do id anim deserunt amet occaecat. Sint irure mollit "
+        "Lorem excepteur ea ex fugiat."
+    )
+
+    builder = message.MessageBuilder().text_with_images_message(text, [])
+
+    assert [i.text for i in builder.messages] == [
+        "Sit sunt culpa duis enim occaecat anim eiusmod",
+        "proident nulla. Qui labore do id anim deserunt",
+        "amet occaecat. Sint irure mollit Lorem excepteur",
+        "ea ex fugiat.",
+    ]
+
+
+@pytest.mark.asyncio()
+async def test_builder_applies_allowed_mentions(channel) -> None:
+    mentions = disnake.AllowedMentions(users=False)
+
+    await message.MessageBuilder(allowed_mentions=mentions).text_with_images_message(
+        "Lorem <@413>", [], suppress_embeds=False
+    ).send(channel)
+
+    channel.send.assert_awaited_once_with(
+        "Lorem <@413>",
+        embeds=[],
+        files=[],
+        suppress_embeds=False,
+        allowed_mentions=mentions,
+    )
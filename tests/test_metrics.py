@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+from pytest_mock import MockerFixture
+
+from robomania.utils import metrics as metrics_module
+from robomania.utils.healthcheck import HealthcheckClient
+from robomania.utils.loop_monitor import LoopLagMonitor
+from robomania.utils.metrics import MetricsRegistry
+
+
+def test_render_counter_and_histogram() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("commands_total", "Commands", ("command", "status"))
+    histogram = registry.histogram("command_seconds", "Latency", ("command",), [0.1, 1])
+
+    counter.inc("poll", "ok")
+    counter.inc("poll", "ok")
+    counter.inc('say "hi"', "error")
+    histogram.observe(0.05, "poll")
+    histogram.observe(0.5, "poll")
+
+    assert registry.render().splitlines() == [
+        "# HELP commands_total Commands",
+        "# TYPE commands_total counter",
+        'commands_total{command="poll",status="ok"} 2',
+        'commands_total{command="say \\"hi\\"",status="error"} 1',
+        "# HELP command_seconds Latency",
+        "# TYPE command_seconds histogram",
+        'command_seconds_bucket{command="poll",le="0.1"} 1',
+        'command_seconds_bucket{command="poll",le="1"} 2',
+        'command_seconds_bucket{command="poll",le="+Inf"} 2',
+        'command_seconds_sum{command="poll"} 0.55',
+        'command_seconds_count{command="poll"} 2',
+    ]
+
+
+def test_series_are_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(metrics_module, "MAX_SERIES_PER_METRIC", 3)
+    counter = MetricsRegistry().counter("requests_total", "Requests", ("path",))
+
+    for i in range(10):
+        counter.inc(f"/{i}")
+
+    assert len(counter.series) == 4
+    assert counter.value(metrics_module.OTHER_LABEL) == 7
+
+
+def test_failing_collector_is_skipped() -> None:
+    registry = MetricsRegistry()
+
+    def collector() -> list[str]:
+        raise RuntimeError
+
+    registry.add_collector(collector)
+    registry.add_collector(lambda: ["up 1"])
+
+    assert registry.render() == "up 1\n"
+
+
+@pytest.mark.asyncio()
+async def test_metrics_endpoint(mocker: MockerFixture) -> None:
+    monitor = LoopLagMonitor()
+    monitor.samples.extend([0.001, 0.5])
+    bot = mocker.Mock(latency=0.25, loop_monitor=monitor)
+    client = HealthcheckClient(bot, mocker.Mock())
+
+    response = await client.metrics(mocker.Mock())
+    body = response.body.decode()
+
+    assert response.content_type == "text/plain"
+    assert "robomania_gateway_latency_seconds 0.25" in body
+    assert "# TYPE robomania_event_loop_lag_seconds gauge" in body
+    assert 'robomania_event_loop_lag_seconds{quantile="0.99"} 0.5' in body
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import math
+
+from pytest_mock import MockerFixture
+
+from robomania.utils import mongo_monitoring
+from robomania.utils.metrics import Histogram
+
+
+def test_histogram_quantiles() -> None:
+    histogram = Histogram([0.1, 1, 10])
+    for value in [0.05] * 50 + [0.5] * 49 + [100]:
+        histogram.observe(value)
+
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.99) == 1
+    assert histogram.quantile(1) == math.inf
+    assert Histogram().quantile(0.5) is None
+
+
+def started(mocker: MockerFixture, request_id: int, command: dict):
+    return mocker.Mock(
+        command=command,
+        command_name=next(iter(command)),
+        database_name="robomania",
+        request_id=request_id,
+        connection_id=("localhost", 27017),
+    )
+
+
+def finished(mocker: MockerFixture, request_id: int, duration: int):
+    return mocker.Mock(
+        request_id=request_id,
+        connection_id=("localhost", 27017),
+        duration_micros=duration,
+    )
+
+
+def test_command_latency_per_collection(mocker: MockerFixture) -> None:
+    listener = mongo_monitoring.CommandLatencyListener()
+
+    listener.started(started(mocker, 1, {"find": "polls", "filter": {}}))
+    listener.started(started(mocker, 2, {"ping": 1}))
+    listener.succeeded(finished(mocker, 1, 2000))
+    listener.failed(finished(mocker, 2, 1000))
+
+    stats = listener.snapshot()
+
+    assert stats["robomania.polls"]["count"] == 1
+    assert stats["robomania.polls"]["sum"] == 0.002
+    assert stats["robomania.$cmd"]["failures"] == 1
+    assert listener.pending == {}
+
+
+def test_collection_labels_are_bounded(mocker: MockerFixture, monkeypatch) -> None:
+    monkeypatch.setattr(mongo_monitoring, "MAX_TRACKED_COLLECTIONS", 2)
+    listener = mongo_monitoring.CommandLatencyListener()
+
+    for i in range(5):
+        listener.started(started(mocker, i, {"find": f"collection{i}"}))
+        listener.succeeded(finished(mocker, i, 1000))
+
+    assert set(listener.snapshot()) == {
+        "robomania.collection0",
+        "robomania.collection1",
+        mongo_monitoring.OTHER_COLLECTIONS,
+    }
+    assert listener.latency[mongo_monitoring.OTHER_COLLECTIONS].count == 3
+
+
+def test_pool_wait(mocker: MockerFixture) -> None:
+    listener = mongo_monitoring.PoolWaitListener()
+
+    listener.connection_check_out_started(mocker.Mock())
+    listener.connection_checked_out(mocker.Mock())
+    listener.connection_check_out_started(mocker.Mock())
+    listener.connection_check_out_failed(mocker.Mock())
+
+    stats = listener.snapshot()
+    assert stats["count"] == 2
+    assert stats["failures"] == 1
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import disnake
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from robomania.models.poll_model import PollModel
+
+
+@pytest.fixture()
+def db() -> AsyncMongoMockClient:
+    return AsyncMongoMockClient().db
+
+
+@pytest.fixture()
+def poll() -> PollModel:
+    return PollModel(1, 2, 3, "pl", "Lorem?", ["ipsum", "dolor"], ["👍", "👎"])
+
+
+def test_votes_are_tallied(poll: PollModel) -> None:
+    assert poll.vote("👍", 10)
+    assert poll.vote("👍", 11)
+    assert poll.vote("👎", 10)
+    assert poll.unvote("👍", 11)
+
+    assert poll.counts == [1, 1]
+
+
+def test_duplicated_events_are_ignored(poll: PollModel) -> None:
+    assert poll.vote("👍", 10)
+    assert not poll.vote("👍", 10)
+    assert poll.unvote("👍", 10)
+    assert not poll.unvote("👍", 10)
+
+    assert poll.counts == [0, 0]
+
+
+def test_unknown_emoji_and_closed_poll_are_ignored(poll: PollModel) -> None:
+    assert not poll.vote("🙃", 10)
+
+    poll.closed = True
+    assert not poll.vote("👍", 10)
+
+    assert poll.counts == [0, 0]
+
+
+@pytest.mark.asyncio()
+async def test_snapshot_is_restored(db, poll: PollModel) -> None:
+    poll.closes_at = datetime(2023, 1, 1, 12, tzinfo=timezone.utc)
+    poll.vote("👍", 10)
+    poll.vote("👎", 11)
+    await poll.save(db)
+
+    poll.vote("👎", 12)
+    await poll.save(db)
+
+    closed = PollModel(4, 2, 3, "pl", "Lorem?", ["ipsum"], ["👍"], closed=True)
+    await closed.save(db)
+
+    restored = await PollModel.get_open(db, datetime.now(timezone.utc))
+
+    assert restored == [poll]
+    assert restored[0].counts == [1, 2]
+    assert restored[0].closes_at.tzinfo is not None
+
+
+@pytest.mark.asyncio()
+async def test_old_open_ended_polls_are_not_restored(db) -> None:
+    now = datetime.now(timezone.utc)
+    recent = PollModel(
+        disnake.utils.time_snowflake(now), 2, 3, "pl", "Lorem?", ["ipsum"], ["👍"]
+    )
+    old = PollModel(
+        disnake.utils.time_snowflake(now - timedelta(days=2)),
+        2,
+        3,
+        "pl",
+        "Lorem?",
+        ["ipsum"],
+        ["👍"],
+    )
+    for i in (recent, old):
+        await i.save(db)
+
+    restored = await PollModel.get_open(db, now - timedelta(days=1))
+
+    assert restored == [recent]
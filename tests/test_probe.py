@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Iterator
+
+import pytest
+
+from robomania.probe import main, probe
+
+
+def serve(status: int) -> HTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self.send_response(status)
+            self.end_headers()
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = HTTPServer(("localhost", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture()
+def silent_socket() -> Iterator[socket.socket]:
+    sock = socket.socket()
+    sock.bind(("localhost", 0))
+    sock.listen()
+    yield sock
+    sock.close()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.parametrize(("status", "expected"), [(200, 0), (530, 1)])
+def test_probe_status(status: int, expected: int) -> None:
+    server = serve(status)
+    try:
+        assert probe(port=server.server_port) == expected
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_probe_connection_refused() -> None:
+    assert main(["--port", str(free_port())]) == 1
+
+
+def test_probe_timeout(silent_socket: socket.socket) -> None:
+    port = silent_socket.getsockname()[1]
+
+    start = time.perf_counter()
+    assert main(["--port", str(port), "--timeout", "0.2"]) == 1
+    assert time.perf_counter() - start < 2
+
+
+def test_probe_startup() -> None:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "robomania.probe"]
+        + ["--port", str(free_port()), "--timeout", "1"],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        check=False,
+    )
+    elapsed = time.perf_counter() - start
+
+    assert result.returncode == 1
+    imported = {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert "http.client" in imported
+    for heavy in ("disnake", "motor", "pymongo", "pydantic", "requests", "click"):
+        assert heavy not in imported
+    assert elapsed < 1
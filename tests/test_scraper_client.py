@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from robomania.utils import scraper_client
+
+
+@pytest.fixture()
+def scraper(httpserver: HTTPServer) -> scraper_client.ScraperClient:
+    client = httpx.AsyncClient(base_url=httpserver.url_for("/"))
+    return scraper_client.ScraperClient(client)
+
+
+@pytest.mark.asyncio()
+async def test_client_is_reused(
+    httpserver: HTTPServer, scraper: scraper_client.ScraperClient
+) -> None:
+    httpserver.expect_request("/posts/unposted").respond_with_json({"data": []})
+
+    await scraper.get("posts/unposted")
+    await scraper.get("posts/unposted")
+
+    assert not scraper.is_closed
+    await scraper.aclose()
+    assert scraper.is_closed
+
+
+@pytest.mark.asyncio()
+async def test_latency_recorded_per_endpoint(
+    httpserver: HTTPServer, scraper: scraper_client.ScraperClient
+) -> None:
+    httpserver.expect_request("/posts/unposted").respond_with_json({"data": []})
+    httpserver.expect_request("/posts/posted", method="POST").respond_with_data("")
+
+    await scraper.get("posts/unposted")
+    await scraper.get("posts/unposted")
+    await scraper.post("posts/posted", json={"ids": []})
+    await scraper.aclose()
+
+    assert len(scraper.latency["posts/unposted"]) == 2
+    assert len(scraper.latency["posts/posted"]) == 1
+    assert scraper.mean_latency("posts/posted") > 0
+    assert scraper.mean_latency("posts/image") is None
+
+
+def test_latency_samples_are_bounded(scraper: scraper_client.ScraperClient) -> None:
+    for _ in range(scraper_client.LATENCY_SAMPLES_PER_ENDPOINT + 10):
+        scraper.record_latency("posts/unposted", 1.0)
+
+    assert (
+        len(scraper.latency["posts/unposted"])
+        == scraper_client.LATENCY_SAMPLES_PER_ENDPOINT
+    )
+
+
+class StubScraper:
+    def __init__(self, posts: list[dict]) -> None:
+        self.posts = posts
+        self.version = 0
+        self.requests = 0
+        self.not_modified = 0
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+    def unposted(self, request: Request) -> Response:
+        self.requests += 1
+        if request.headers.get("If-None-Match") == self.etag:
+            self.not_modified += 1
+            return Response(status=304)
+
+        return Response(
+            json.dumps({"data": self.posts}),
+            content_type="application/json",
+            headers={"ETag": self.etag},
+        )
+
+    def posted(self, request: Request) -> Response:
+        ids = set(request.json["ids"])
+        self.posts = [i for i in self.posts if i["post_id"] not in ids]
+        self.version += 1
+        return Response("")
+
+
+@pytest.fixture()
+def stub_scraper(httpserver: HTTPServer) -> StubScraper:
+    stub = StubScraper([{"post_id": "1"}, {"post_id": "2"}])
+    httpserver.expect_request("/posts/unposted").respond_with_handler(stub.unposted)
+    httpserver.expect_request("/posts/posted", method="POST").respond_with_handler(
+        stub.posted
+    )
+    return stub
+
+
+@pytest.mark.asyncio()
+async def test_unchanged_posts_are_not_downloaded_again(
+    stub_scraper: StubScraper, scraper: scraper_client.ScraperClient
+) -> None:
+    posts = await scraper.get_unposted()
+    assert [i["post_id"] for i in posts] == ["1", "2"]
+    assert await scraper.mark_as_posted(i["post_id"] for i in posts)
+
+    assert await scraper.get_unposted() == []
+    assert await scraper.get_unposted() == []
+    await scraper.aclose()
+
+    assert stub_scraper.requests == 3
+    assert stub_scraper.not_modified == 1
+
+
+@pytest.mark.asyncio()
+async def test_posts_not_marked_as_posted_are_skipped(
+    httpserver: HTTPServer,
+    stub_scraper: StubScraper,
+    scraper: scraper_client.ScraperClient,
+) -> None:
+    httpserver.clear()
+    httpserver.expect_request("/posts/unposted").respond_with_handler(
+        stub_scraper.unposted
+    )
+    httpserver.expect_request("/posts/posted", method="POST").respond_with_data(
+        "", status=500
+    )
+
+    posts = await scraper.get_unposted()
+    assert not await scraper.mark_as_posted(i["post_id"] for i in posts)
+
+    assert await scraper.get_unposted() == []
+    assert await scraper.get_unposted() == []
+    await scraper.aclose()
+
+    assert scraper.unacknowledged == {"1", "2"}
+    assert stub_scraper.not_modified == 1
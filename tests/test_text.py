@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import re
+import timeit
+from functools import partial
+from textwrap import TextWrapper
+
+import disnake
+import pytest
+from faker import Faker
+
+from robomania.utils import text
+from robomania.utils.pipe import Pipe
+
+old_pipeline = (
+    Pipe()
+    | partial(re.compile(" +").sub, " ")
+    | partial(re.compile(" (?=[.,?!–—-])").sub, "")
+    | partial(re.compile("\\.{3}").sub, "…")
+)
+old_pipeline_with_escape = old_pipeline.copy() | disnake.utils.escape_markdown
+
+
+def messy_text(faker: Faker, length: int) -> str:
+    words = faker.text(length).split(" ")
+    decorations = ["  ", " ...", " ,", "*", "_", " - ", "~~", "`", "\n> ", "\n"]
+    return " ".join(
+        word + decorations[i % len(decorations)] if i % 3 == 0 else word
+        for i, word in enumerate(words)
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "  Lorem  Ipsum... -+  abc .*abc*  ",
+        "a ...",
+        "....",
+        "> quote\n>>> block quote\n>  spaced quote\n> . not quote",
+        ">  ?,",
+        ">>>   - not quote",
+        "[link  text](https://example.org/a_b)",
+        "see https://example.org/some_path_ .",
+        "<https://example.org/a_b>",
+        "~~strike~~ __under__ `code` |spoiler|",
+    ],
+)
+@pytest.mark.parametrize("escape_markdown", [False, True])
+def test_normalizer_matches_separate_passes(value: str, escape_markdown: bool) -> None:
+    expected = (old_pipeline_with_escape if escape_markdown else old_pipeline)(value)
+
+    assert text.TextNormalizer(escape_markdown)(value) == expected
+
+
+@pytest.mark.parametrize("escape_markdown", [False, True])
+def test_normalizer_matches_separate_passes_random(
+    faker: Faker, escape_markdown: bool
+) -> None:
+    old = old_pipeline_with_escape if escape_markdown else old_pipeline
+    normalizer = text.TextNormalizer(escape_markdown)
+
+    for _ in range(20):
+        value = messy_text(faker, 2000)
+        assert normalizer(value) == old(value)
+
+
+def test_splitter_short_text() -> None:
+    assert text.TextSplitter(50).wrap("  Lorem ipsum  ") == ["Lorem ipsum"]
+
+
+def test_splitter_prefers_paragraphs_and_sentences() -> None:
+    value = (
+        "Sit sunt culpa duis enim occaecat.\n\nAnim eiusmod proident nulla. "
+        "Qui labore do id anim deserunt amet occaecat."
+    )
+
+    assert text.TextSplitter(50).wrap(value) == [
+        "Sit sunt culpa duis enim occaecat.",
+        "Anim eiusmod proident nulla.",
+        "Qui labore do id anim deserunt amet occaecat.",
+    ]
+
+
+def test_splitter_does_not_add_chunks_for_sentences() -> None:
+    value = (
+        "Sit sunt culpa duis enim occaecat.\n\nAnim eiusmod proident nulla. "
+        "Qui labore do id anim deserunt amet occaecat. Sint irure mollit."
+    )
+
+    assert text.TextSplitter(50).wrap(value) == [
+        "Sit sunt culpa duis enim occaecat.",
+        "Anim eiusmod proident nulla. Qui labore do id anim",
+        "deserunt amet occaecat. Sint irure mollit.",
+    ]
+
+
+@pytest.mark.parametrize(
+    "entity",
+    [
+        "\\*",
+        "<t:1234567890:F>",
+        "<@123456789>",
+        "<@&123456789>",
+        "<#123456789>",
+        "<:emote:123456789>",
+        "https://example.org/some-path",
+    ],
+)
+def test_splitter_does_not_cut_entities(entity: str) -> None:
+    value = f"ab{entity}cd"
+
+    for width in range(len(entity), len(value)):
+        chunks = text.TextSplitter(width).wrap(value)
+
+        assert any(entity in i for i in chunks)
+        assert "".join(chunks) == value
+
+
+def test_splitter_minimal_number_of_chunks(faker: Faker) -> None:
+    for _ in range(20):
+        value = messy_text(faker, 5000)
+        wrapper = TextWrapper(
+            200, expand_tabs=False, replace_whitespace=False, break_on_hyphens=False
+        )
+
+        chunks = text.TextSplitter(200).wrap(value)
+
+        assert all(len(i) <= 200 for i in chunks)
+        assert len(chunks) <= len(wrapper.wrap(value))
+
+
+def test_splitter_breaks_long_words() -> None:
+    assert text.TextSplitter(4).wrap("abcdefghij") == ["abcd", "efgh", "ij"]
+
+
+def test_splitter_keeps_all_words(faker: Faker) -> None:
+    value = messy_text(faker, 20000)
+
+    chunks = text.TextSplitter(2000).wrap(value)
+
+    assert all(len(i) <= 2000 for i in chunks)
+    assert " ".join(chunks).split() == value.split()
+
+
+def test_benchmark_100kb_post(faker: Faker) -> None:
+    value = messy_text(faker, 100_000)
+    while len(value) < 100_000:
+        value += messy_text(faker, 100_000)
+
+    wrapper = TextWrapper(2000, expand_tabs=False, replace_whitespace=False)
+    normalizer = text.TextNormalizer(escape_markdown=True)
+    splitter = text.TextSplitter(2000)
+
+    old = min(
+        timeit.repeat(
+            lambda: wrapper.wrap(old_pipeline_with_escape(value.strip())),
+            number=1,
+            repeat=3,
+        )
+    )
+    new = min(
+        timeit.repeat(lambda: splitter.wrap(normalizer(value)), number=1, repeat=3)
+    )
+    assert new < old
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import io
 import logging
+import time
+from contextlib import aclosing
 
+import disnake
+import pytest
 from pytest_mock import MockerFixture
 
 from robomania import utils
-from robomania.utils import pipe
+from robomania.utils import pipe, reactions
 
 
 def test_rewindable_buffer(mocker: MockerFixture) -> None:
@@ -54,6 +59,71 @@ def test_preconfigure_missing_method(caplog) -> None:
     assert "Preconfiguration method missing" in caplog.text
 
 
+class TestPrefetch:
+    @pytest.mark.asyncio()
+    async def test_results_in_order(self) -> None:
+        async def prepare(i: int) -> int:
+            await asyncio.sleep((10 - i) / 1000)
+            return i
+
+        results = [i async for i in utils.prefetch(map(prepare, range(10)), 3)]
+
+        assert results == list(range(10))
+
+    @pytest.mark.asyncio()
+    async def test_bounded_number_of_prefetched(self) -> None:
+        running = 0
+        max_running = 0
+
+        async def prepare(i: int) -> int:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return i
+
+        async for _ in utils.prefetch(map(prepare, range(20)), 3):
+            await asyncio.sleep(0.005)
+
+        assert max_running == 3
+
+    @pytest.mark.asyncio()
+    async def test_prepare_overlaps_with_consumer(self) -> None:
+        delay = 0.02
+
+        async def prepare(i: int) -> int:
+            await asyncio.sleep(delay)
+            return i
+
+        start = time.perf_counter()
+        async for _ in utils.prefetch(map(prepare, range(20)), 3):
+            await asyncio.sleep(delay)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 20 * 2 * delay * 0.75
+
+    @pytest.mark.asyncio()
+    async def test_pending_cancelled_on_exit(self) -> None:
+        started: list[asyncio.Task] = []
+
+        async def prepare(i: int) -> int:
+            started.append(asyncio.current_task())  # type: ignore
+            await asyncio.sleep(i)
+            return i
+
+        async def consume() -> None:
+            async with aclosing(utils.prefetch(map(prepare, range(3)), 3)) as results:
+                async for _ in results:
+                    raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            await consume()
+
+        await asyncio.sleep(0)
+        assert all(i.cancelled() for i in started[1:])
+
+
 class TestPipe:
     @staticmethod
     def f1(x):
@@ -77,26 +147,125 @@ class TestPipe:
 
     def test_adding_stages(self) -> None:
         p = pipe.Pipe(self.f1)
-        p | self.f2 | self.f3
-        p.add(self.f4)
+        p = p | self.f2 | self.f3
+        p = p.add(self.f4)
         p = self.f5 | p
 
-        assert p.pipeline == [self.f5, self.f1, self.f2, self.f3, self.f4]
+        assert p.pipeline == (self.f5, self.f1, self.f2, self.f3, self.f4)
+
+    def test_adding_stages_does_not_mutate(self) -> None:
+        p = pipe.Pipe(self.f1)
+        p | self.f2
+        p.add(self.f3)
+        self.f4 | p
+
+        assert p.pipeline == (self.f1,)
 
     def test_run(self) -> None:
         p = pipe.Pipe(self.f1)
-        p | self.f2 | self.f3
-        p.add(self.f4)
+        p = p | self.f2 | self.f3
+        p = p.add(self.f4)
         p = self.f5 | p
 
         assert p(20) == 196
 
+    def test_run_empty(self) -> None:
+        assert pipe.Pipe()(20) == 20
+
+    def test_compile(self) -> None:
+        p = pipe.Pipe(self.f5, self.f1, self.f2, self.f3, self.f4)
+
+        assert p.compile()(20) == 196
+
+    def test_timings(self) -> None:
+        p = pipe.Pipe(self.f1, self.f2)
+        p.enable_timings()
+
+        assert p(20) == 22
+        assert p(20) == 22
+
+        assert p.calls == 2
+        assert len(p.timings_report()) == 2
+        assert all(i > 0 for i in p.timings)
+
+        p.enable_timings(False)
+        p(20)
+
+        assert p.calls == 0
+
     def test_copy(self) -> None:
         p1 = pipe.Pipe(self.f1)
         p2 = p1.copy()
 
         assert p1.pipeline == p2.pipeline
 
-        p2.add(self.f2)
+        p2 = p2.add(self.f2)
 
         assert p1.pipeline != p2.pipeline
+
+
+class TestReactionApplier:
+    @pytest.fixture()
+    def message(self, mocker: MockerFixture):
+        message = mocker.Mock()
+        message.channel.id = 413
+        message.add_reaction = mocker.AsyncMock()
+        return message
+
+    @pytest.mark.asyncio()
+    async def test_reactions_are_added_in_order(
+        self, message, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(reactions, "REACTION_PER", 0.01)
+        emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣"]
+
+        elapsed = await reactions.ReactionApplier().add_reactions(message, emojis)
+
+        assert [i.args[0] for i in message.add_reaction.await_args_list] == emojis
+        # First token is available immediately.
+        assert elapsed >= 0.03
+
+    @pytest.mark.asyncio()
+    async def test_token_wait_overlaps_request(
+        self, message, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(reactions, "REACTION_PER", 0.05)
+        started: list[float] = []
+
+        async def add_reaction(emoji: str) -> None:
+            started.append(time.perf_counter())
+            await asyncio.sleep(0.05)
+
+        message.add_reaction.side_effect = add_reaction
+
+        elapsed = await reactions.ReactionApplier().add_reactions(
+            message, ["1️⃣", "2️⃣", "3️⃣", "4️⃣"]
+        )
+
+        # Sequential waiting would take 4 requests and 3 token waits.
+        assert elapsed < 0.3
+        assert all(b - a >= 0.045 for a, b in zip(started, started[1:]))
+
+    @pytest.mark.asyncio()
+    async def test_rate_limited_reaction_is_retried(
+        self, message, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(reactions, "REACTION_PER", 0.01)
+        response = mocker.Mock(status=429, reason="", headers={"Retry-After": "0.01"})
+        error = disnake.HTTPException(response, {"code": 0, "message": ""})
+        message.add_reaction.side_effect = [None, error, None]
+
+        await reactions.ReactionApplier().add_reactions(message, ["👍", "👎"])
+
+        assert message.add_reaction.await_count == 3
+
+    @pytest.mark.asyncio()
+    async def test_other_errors_are_raised(
+        self, message, mocker: MockerFixture
+    ) -> None:
+        response = mocker.Mock(status=403, reason="", headers={})
+        error = disnake.HTTPException(response, {"code": 0, "message": ""})
+        message.add_reaction.side_effect = error
+
+        with pytest.raises(disnake.HTTPException):
+            await reactions.ReactionApplier().add_reactions(message, ["👍"])